@@ -1,26 +1,332 @@
-from crewai import Agent, Task, Crew, Process
-from crewai_tools import BraveSearchTool
-from typing import Optional, List
+from crewai import Agent, Task, Crew, Process, LLM
+from crewai.utilities.events import crewai_event_bus, LLMStreamChunkEvent
+from typing import Optional, List, Dict, Tuple, Any, Callable
+from functools import cached_property
 import os
-from dotenv import load_dotenv
+import re
+import json
+import asyncio
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from dotenv import load_dotenv, find_dotenv
+from pydantic import PrivateAttr
 from config import LLMConfig
 
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+except ImportError:
+    RecursiveCharacterTextSplitter = None
+
+# LangChain caches and crewai_tools are imported on first use, since they
+# dominate start-up time and are not needed to read reports or parse resumes
+
+# Agents whose output depends on live web data and must never be served from the LLM cache
+UNCACHED_AGENTS = {"researcher"}
+
+# Agents that receive near-identical payloads for comparable candidates/jobs
+SEMANTIC_CACHE_AGENTS = {"matcher", "report_generator"}
+
+# Agents with long outputs that are worth streaming token by token
+STREAMING_AGENTS = {"matcher", "report_generator"}
+
+# --- Task instructions ---
+# Static instructions come first and per-run data (resume path, job description)
+# is appended at the end, so providers with prompt caching can reuse the prefix.
+
+TOTAL_MATCH_SCORE_INSTRUCTION = """ВАЖЛИВО: У кінці відповіді окремим рядком напиши: Total Match Score: NN, де NN — реальне число від 0 до 100, яке ти розрахував на основі аналізу. Не використовуй XX, не залишай це поле порожнім, обов'язково підстав реальне число.
+IMPORTANT: At the end of your answer, write a separate line: Total Match Score: NN, where NN is a real number from 0 to 100 that you calculated. Do NOT use XX, do NOT leave it blank, always provide a real number.
+Example:
+...
+Total Match Score: 87"""
+
+DOC_PROCESSOR_INSTRUCTIONS = """Process the resume file given at the end of this task.
+Extract key information including:
+- Personal information (name, contact details)
+- Technical skills and proficiency levels
+- Work experience and responsibilities
+- Education and certifications
+- Projects and achievements
+
+If it's a PDF, use PyMuPDF concepts.
+If it's a DOCX, use python-docx concepts.
+If it's HTML, use BeautifulSoup concepts.
+If it's TXT, use standard text processing.
+
+Format the output as a structured JSON object with clear hierarchical organization."""
+
+JOB_ANALYZER_INSTRUCTIONS = """Analyze the job description given at the end of this task.
+
+Extract and classify requirements as:
+1. Mandatory skills/qualifications
+2. Preferred/nice-to-have skills
+3. Experience requirements (with minimum years if specified)
+4. Education requirements
+5. Soft skills and personal attributes
+
+Prioritize the requirements based on their importance and prominence in the description.
+Format your output as a structured JSON with clear categorization and priority levels."""
+
+SKILLS_ANALYZER_INSTRUCTIONS = """Analyze the technical skills and experience extracted from the resume.
+For each skill mentioned:
+- Validate the skill against current industry standards
+- Assess the depth of experience
+- Check for relevant certifications
+- Look for practical applications in projects
+
+Calculate the total years of experience in relevant positions.
+Classify the experience by categories (e.g., frontend, backend, DevOps).
+Identify the candidate's areas of specialization.
+
+Provide a detailed analysis with confidence scores for each skill assessment."""
+
+RESEARCHER_INSTRUCTIONS = """Research and verify the candidate's background:
+- Verify listed companies and positions
+- Look for public work (GitHub, technical blogs, etc.)
+- Find additional projects or contributions
+- Check for relevant industry presence
+- Look for social media profiles that might provide additional insights
+
+Focus on professional information that validates or enhances what's in the resume.
+Compile findings into a comprehensive report, clearly distinguishing between
+verified information and potential matches that need confirmation."""
+
+MATCHER_INSTRUCTIONS = f"""Analyze all gathered information and calculate a match score:
+1. Compare the candidate's skills and experience against the job requirements
+2. Weigh mandatory requirements more heavily than preferred ones
+3. Give special attention to years of experience in relevant positions
+4. Consider certifications, education, and project experience
+5. Factor in insights from online research
+
+Provide a final evaluation including:
+1. Overall match score (0-100)
+2. Sub-scores for different requirement categories
+3. Key strengths
+4. Potential areas of concern
+5. Hiring recommendation
+6. Suggested interview focus areas
+
+{TOTAL_MATCH_SCORE_INSTRUCTION}"""
+
+REPORT_GENERATOR_INSTRUCTIONS = f"""Generate a comprehensive report based on all previous analyses:
+1. Executive summary with key findings and recommendation
+2. Candidate profile overview
+3. Skills assessment visualization
+4. Experience timeline
+5. Match analysis with detailed scoring
+6. Online presence summary
+7. Areas for further exploration in interviews
+8. Final recommendation
+
+Format the report in a clean, professional structure with clear sections.
+Use markdown formatting for better readability.
+
+ВАЖЛИВО: Використовуй реальні результати попередніх агентів (аналіз навичок, досвіду, job description, оцінку matcher) для формування звіту. Не описуй процес, а генеруй реальний звіт з оцінками та числовим Total Match Score (число, яке matcher розрахував у попередньому кроці).
+
+{TOTAL_MATCH_SCORE_INSTRUCTION}"""
+
+FEEDBACK_PLACEHOLDER_INSTRUCTIONS = """This is a placeholder task for the CLI. 
+In the UI, user feedback is processed separately by the FeedbackProcessorAgent.
+For CLI runs, this task simply notes that feedback would be collected in an interactive scenario."""
+
+def _build_llm_cache(config: LLMConfig):
+    """Return the LangChain cache backend selected in config.yaml, or None when disabled"""
+    if not config.cache:
+        return None
+    if config.cache == "inmemory":
+        from langchain_core.caches import InMemoryCache
+        return InMemoryCache()
+    if config.cache == "sqlite":
+        from langchain_community.cache import SQLiteCache
+        return SQLiteCache(database_path=config.cache_path)
+    if config.cache == "redis":
+        import redis
+        from langchain_community.cache import RedisCache
+        return RedisCache(redis.Redis.from_url(config.cache_url or "redis://localhost:6379"))
+    raise ValueError(f"Unsupported LLM cache backend: {config.cache}")
+
+class CachedLLM(LLM):
+    """crewAI LLM that answers repeated prompts from a LangChain cache backend
+    
+    With stream=True, crewAI's console listener prints the tokens as they arrive.
+    Calls that offer tools always reach the provider, since their answer may be
+    a function call rather than text. cache_scope is part of every cache key, so
+    entries are only shared between calls with the same scope.
+    """
+
+    def __init__(self, response_cache=None, cache_scope: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.response_cache = response_cache
+        self.cache_scope = cache_scope
+
+    def _cache_key(self, messages) -> Tuple[str, str]:
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        prompt = "\n\n".join(f"{m.get('role')}: {m.get('content')}" for m in messages)
+        llm_string = json.dumps({"model": self.model, "base_url": self.base_url,
+                                 "temperature": self.temperature, "max_tokens": self.max_tokens,
+                                 "scope": self.cache_scope},
+                                sort_keys=True)
+        return prompt, llm_string
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None):
+        if self.response_cache is None or tools:
+            return super().call(messages, tools, callbacks, available_functions)
+        prompt, llm_string = self._cache_key(messages)
+        cached = self.response_cache.lookup(prompt, llm_string)
+        if cached:
+            if self.stream:
+                # Streamed output still shows up on stdout, as a single chunk
+                crewai_event_bus.emit(self, event=LLMStreamChunkEvent(chunk=cached[0].text))
+            return cached[0].text
+        result = super().call(messages, tools, callbacks, available_functions)
+        if isinstance(result, str) and result:
+            from langchain_core.outputs import Generation
+            self.response_cache.update(prompt, llm_string, [Generation(text=result)])
+        return result
+
+def _build_semantic_cache(config: LLMConfig):
+    """Return a Redis-backed embedding-similarity cache, or None when disabled"""
+    if config.semantic_cache_threshold is None:
+        return None
+    from langchain_community.cache import RedisSemanticCache
+    from langchain_openai import OpenAIEmbeddings
+    return RedisSemanticCache(
+        redis_url=config.cache_url or "redis://localhost:6379",
+        embedding=OpenAIEmbeddings(),
+        # RedisSemanticCache compares cosine distance, not similarity
+        score_threshold=1 - config.semantic_cache_threshold
+    )
+
+# mtime of .env when it was last loaded (None if there was no file); _ENV_UNLOADED before the first load
+_ENV_UNLOADED = object()
+_env_loaded_mtime: Any = _ENV_UNLOADED
+
+def _ensure_env() -> None:
+    """Load .env and export the Brave key, reading .env again only after it has changed
+    
+    A reload overrides the values loaded before, so keys saved from the app's
+    settings page take effect without restarting the process.
+    """
+    global _env_loaded_mtime
+    dotenv_path = find_dotenv()  # The .env load_dotenv() would pick
+    try:
+        mtime = os.path.getmtime(dotenv_path) if dotenv_path else None
+    except OSError:
+        mtime = None
+    if mtime != _env_loaded_mtime:
+        load_dotenv(dotenv_path, override=_env_loaded_mtime is not _ENV_UNLOADED)
+        _env_loaded_mtime = mtime
+    brave_api_key = os.getenv("BRAVE_API_KEY", "")
+    if not brave_api_key:
+        raise ValueError("BRAVE_API_KEY not found in environment variables (.env)")
+    os.environ["BRAVE_SEARCH_API_KEY"] = brave_api_key  # Set the environment variable that LangChain expects
+
+def _chain_callbacks(first: Callable[[Any], None], second: Callable[[Any], None]) -> Callable[[Any], None]:
+    """Callback that calls first and then second with the same output"""
+    def chained(output):
+        first(output)
+        second(output)
+    return chained
+
+def _is_json_output(text: str) -> bool:
+    """Check whether an agent answer is a JSON document, optionally inside a ``` fence"""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        json.loads(text)
+        return True
+    except ValueError:
+        return False
+
+# Agent definitions for create_agent(); "llm" names the config entry when it differs
+# from the agent name, and "search" gives the agent the rate-limited Brave Search tool
+_AGENT_PROFILES = {
+    "document_processor": {
+        "role": "Document Processing Specialist",
+        "goal": "Extract and structure information from resumes in various formats (PDF, DOCX, HTML, TXT)",
+        "backstory": """You are an expert in processing resumes in various formats.
+            Your strength lies in identifying and extracting key information while
+            maintaining the context and relationships between different elements.
+            You handle PDF, DOCX, HTML, and TXT formats with equal expertise.""",
+        "allow_delegation": False
+    },
+    "resume_analyzer": {
+        "role": "Resume Analyzer",
+        "goal": "Analyze candidate experience and skills with focus on years in similar positions",
+        "backstory": """You are a technical expert who can evaluate the depth and
+            breadth of technical skills. You understand both current and emerging
+            technologies, and can assess a candidate's technical capabilities.
+            You excel at determining how long a candidate has worked in relevant positions
+            and classifying their experience by categories.""",
+        "allow_delegation": True,
+        "llm": "skills_analyzer",
+        "search": True
+    },
+    "job_analyzer": {
+        "role": "Job Requirements Analyzer",
+        "goal": "Identify key requirements and prioritize them based on importance",
+        "backstory": """You are specialized in understanding job descriptions and
+            extracting the core requirements. You can distinguish between mandatory
+            and preferred skills, and identify critical metrics like minimum years
+            of experience or necessary qualifications. You understand what employers
+            are really looking for in candidates.""",
+        "allow_delegation": True
+    },
+    "researcher": {
+        "role": "Candidate Researcher",
+        "goal": "Find additional information about candidates from public sources",
+        "backstory": """You are a skilled researcher who can find and verify
+            professional information from various online sources. You know how to
+            validate claims and discover additional context about a candidate's
+            experience. You analyze GitHub profiles, social media, technical blogs,
+            and professional networks to build a comprehensive picture.""",
+        "allow_delegation": True,
+        "search": True
+    },
+    "matcher": {
+        "role": "Matching Specialist",
+        "goal": "Calculate match scores between candidates and job requirements",
+        "backstory": """You are an expert at evaluating how well candidates match
+            job requirements. You can weigh different factors appropriately, with
+            special attention to years of relevant experience. You create accurate 
+            algorithms to determine the best fit and can rank candidates objectively.
+            You synthesize information from multiple sources to make well-rounded
+            hiring recommendations.""",
+        "allow_delegation": True
+    },
+    "report_generator": {
+        "role": "Report Generator",
+        "goal": "Create comprehensive, readable reports on candidate suitability",
+        "backstory": """You transform complex data into actionable insights and 
+            recommendations. You create clear, structured reports that highlight
+            key findings about candidates. You excel at visualizing data and
+            presenting information in an accessible format. Your reports help
+            recruiters and hiring managers make informed decisions quickly.""",
+        "allow_delegation": False
+    }
+}
+
+# Agents of the screening crew, in task order
+AGENT_NAMES = list(_AGENT_PROFILES) + ["feedback_processor"]
+
 class ResumeScreeningAgents:
-    def __init__(self):
-        load_dotenv()
+    def __init__(self, cache_dir: str = "reports"):
+        # Load .env and configure Brave Search (again only after .env changes)
+        _ensure_env()
 
+        # LLMs shared by agents with identical settings
+        self._llm_cache: Dict[Tuple, LLM] = {}
         
-        # Configure Brave Search
-        brave_api_key = os.getenv("BRAVE_API_KEY", "")
-        if not brave_api_key:
-            raise ValueError("BRAVE_API_KEY not found in environment variables (.env)")
-        os.environ["BRAVE_SEARCH_API_KEY"] = brave_api_key  # Set the environment variable that LangChain expects
-
-        # Load LLM config from YAML
-        try:
-            self.llm_config = LLMConfig.from_yaml()
-        except Exception as e:
-            raise RuntimeError(f"Failed to load LLM config: {e}")
+        # Job description analyses keyed by sha256 of the job analyzer's model and the job description
+        self._jd_cache_path = os.path.join(cache_dir, ".jd_cache.json")
+        self._jd_cache: Dict[str, str] = self._load_jd_cache()
+        # Async tasks finish on worker threads, so writes to the JD cache are serialized
+        self._jd_cache_lock = threading.Lock()
         
         # Initialize agent attributes
         self.document_processor: Optional[Agent] = None
@@ -31,132 +337,217 @@ class ResumeScreeningAgents:
         self.report_generator: Optional[Agent] = None
         self.feedback_processor: Optional[FeedbackProcessorAgent] = None #Type hint for specific agent
         
-    def _get_llm(self, agent_name: str):
-        """Return a LangChain LLM instance based on config for the agent."""
+    @cached_property
+    def llm_config(self) -> LLMConfig:
+        """LLM config from YAML, loaded when first needed"""
+        try:
+            config = LLMConfig.from_yaml()
+        except Exception as e:
+            raise RuntimeError(f"Failed to load LLM config: {e}")
+        return config
+    
+    @cached_property
+    def _response_cache(self):
+        """Exact-match cache: identical prompts are answered without calling the provider"""
+        return _build_llm_cache(self.llm_config)
+    
+    @cached_property
+    def _semantic_cache(self):
+        return _build_semantic_cache(self.llm_config)
+    
+    @cached_property
+    def _search_limiter(self):
+        """Brave Search rate limiter shared by every crew built by this instance"""
+        from search_tools import RateLimiter
+        return RateLimiter(self.llm_config.brave_rps)
+    
+    def _get_llm(self, agent_name: str, stream: bool = False, cache_scope: Optional[str] = None) -> LLM:
+        """Return the crewAI LLM for the agent, built from its config.
+        
+        Agents with identical settings share a single LLM instance; crewAI uses
+        LLM objects as given, so the instance returned here is the one that runs.
+        Agents listed in UNCACHED_AGENTS bypass the response cache, while
+        SEMANTIC_CACHE_AGENTS use the semantic cache when it is enabled and a
+        cache_scope (see semantic_cache_scope) is given; their LLM is then built
+        for that scope alone, so one candidate is never served another's answer.
+        With stream=True, STREAMING_AGENTS print tokens to stdout as they arrive.
+        """
         config = self.llm_config.for_agent(agent_name)
+        if agent_name in UNCACHED_AGENTS:
+            cache_kind = None
+        elif (agent_name in SEMANTIC_CACHE_AGENTS and cache_scope is not None
+              and self._semantic_cache is not None):
+            cache_kind = "semantic"
+        else:
+            cache_kind = "exact"
+        stream = stream and agent_name in STREAMING_AGENTS
+        key = (config.provider, config.model_name, config.server_url,
+               config.temperature, config.max_tokens, cache_kind, stream)
+        if cache_kind != "semantic" and key in self._llm_cache:
+            return self._llm_cache[key]
+        cache = {"exact": self._response_cache, "semantic": self._semantic_cache}.get(cache_kind)
+        cache_scope = cache_scope if cache_kind == "semantic" else None
+        
         if config.provider == "openai":
-            from langchain_openai import ChatOpenAI
             api_key = config.api_key or os.getenv("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY not set in .env or config.yaml")
-            return ChatOpenAI(
-                api_key=api_key,
+            llm = CachedLLM(
+                response_cache=cache,
+                cache_scope=cache_scope,
                 model=config.model_name,
+                api_key=api_key,
                 temperature=config.temperature,
-                max_tokens=config.max_tokens
+                max_tokens=config.max_tokens,
+                stream=stream
             )
         elif config.provider == "ollama":
-            from langchain_ollama import OllamaLLM
-            # Only pass supported arguments: model, base_url, temperature
-            return OllamaLLM(
+            # model_name already carries the ollama/ prefix litellm routes on
+            llm = CachedLLM(
+                response_cache=cache,
+                cache_scope=cache_scope,
                 model=config.model_name,
                 base_url=config.server_url,
-                temperature=config.temperature
+                temperature=config.temperature,
+                stream=stream
             )
         else:
             raise ValueError(f"Unsupported LLM provider: {config.provider}")
         
-    def create_agents(self):
-        """Create all necessary agents for resume screening"""
+        if cache_kind != "semantic":
+            self._llm_cache[key] = llm
+        return llm
+    
+    def semantic_cache_scope(self, resume_path: str, job_description: str) -> Optional[str]:
+        """Scope for the semantic cache: SHA-256 of the resume bytes and the job description
         
-        # Tools initialization
-        brave_search = BraveSearchTool(n_results=3) # Limit search results
+        Similar prompts are only matched within one resume/job pair; None when the
+        semantic cache is disabled.
+        """
+        if self._semantic_cache is None:
+            return None
+        from document_parsers import file_digest
+        scope = file_digest(resume_path, hashlib.sha256())
+        scope.update(job_description.encode("utf-8"))
+        return scope.hexdigest()
         
-        # 1. Document processor agent
-        self.document_processor = Agent(
-            role="Document Processing Specialist",
-            goal="Extract and structure information from resumes in various formats (PDF, DOCX, HTML, TXT)",
-            backstory="""You are an expert in processing resumes in various formats.
-            Your strength lies in identifying and extracting key information while
-            maintaining the context and relationships between different elements.
-            You handle PDF, DOCX, HTML, and TXT formats with equal expertise.""",
-            allow_delegation=False,
-            llm=self._get_llm("document_processor")
-        )
+    def create_agent(self, name: str, stream: bool = False, cache_scope: Optional[str] = None) -> Agent:
+        """Create a single agent by name, e.g. "researcher" or "feedback_processor"
         
-        # 2. Resume/Skills analyzer agent
-        self.resume_analyzer = Agent(
-            role="Resume Analyzer",
-            goal="Analyze candidate experience and skills with focus on years in similar positions",
-            backstory="""You are a technical expert who can evaluate the depth and
-            breadth of technical skills. You understand both current and emerging
-            technologies, and can assess a candidate's technical capabilities.
-            You excel at determining how long a candidate has worked in relevant positions
-            and classifying their experience by categories.""",
-            tools=[brave_search],
-            allow_delegation=True,
-            llm=self._get_llm("skills_analyzer")
-        )
+        stream=True streams the output of STREAMING_AGENTS to stdout; cache_scope
+        is passed to _get_llm.
+        """
+        if name == "feedback_processor":
+            return FeedbackProcessorAgent(self._get_llm("feedback_processor"))
+        if name not in _AGENT_PROFILES:
+            raise ValueError(f"Unknown agent: {name}")
+        profile = _AGENT_PROFILES[name]
         
-        # 3. Job description analyzer agent
-        self.job_analyzer = Agent(
-            role="Job Requirements Analyzer",
-            goal="Identify key requirements and prioritize them based on importance",
-            backstory="""You are specialized in understanding job descriptions and
-            extracting the core requirements. You can distinguish between mandatory
-            and preferred skills, and identify critical metrics like minimum years
-            of experience or necessary qualifications. You understand what employers
-            are really looking for in candidates.""",
-            allow_delegation=True,
-            llm=self._get_llm("job_analyzer")
-        )
+        tools = []
+        if profile.get("search"):
+            from search_tools import RateLimitedBraveSearchTool
+            # Every search tool shares this instance's limiter, so one budget paces them all
+            tools = [RateLimitedBraveSearchTool(n_results=3, limiter=self._search_limiter)] # Limit search results
         
-        # 4. Researcher agent
-        self.researcher = Agent(
-            role="Candidate Researcher",
-            goal="Find additional information about candidates from public sources",
-            backstory="""You are a skilled researcher who can find and verify
-            professional information from various online sources. You know how to
-            validate claims and discover additional context about a candidate's
-            experience. You analyze GitHub profiles, social media, technical blogs,
-            and professional networks to build a comprehensive picture.""",
-            tools=[brave_search],
-            allow_delegation=True,
-            llm=self._get_llm("researcher")
+        return Agent(
+            role=profile["role"],
+            goal=profile["goal"],
+            backstory=profile["backstory"],
+            tools=tools,
+            allow_delegation=profile["allow_delegation"],
+            llm=self._get_llm(profile.get("llm", name), stream=stream, cache_scope=cache_scope)
         )
+    
+    def create_agents(self, stream: bool = False, cache_scope: Optional[str] = None):
+        """Create all necessary agents for resume screening
         
-        # 5. Matcher/Evaluator agent
-        self.matcher = Agent(
-            role="Matching Specialist",
-            goal="Calculate match scores between candidates and job requirements",
-            backstory="""You are an expert at evaluating how well candidates match
-            job requirements. You can weigh different factors appropriately, with
-            special attention to years of relevant experience. You create accurate 
-            algorithms to determine the best fit and can rank candidates objectively.
-            You synthesize information from multiple sources to make well-rounded
-            hiring recommendations.""",
-            allow_delegation=True,
-            llm=self._get_llm("evaluator")
-        )
+        stream=True streams the matcher and report generator output to stdout;
+        cache_scope enables the semantic cache for one resume/job pair.
+        """
+        for name in AGENT_NAMES:
+            setattr(self, name, self.create_agent(name, stream=stream, cache_scope=cache_scope))
+        return [getattr(self, name) for name in AGENT_NAMES]
+
+    def _jd_cache_key(self, job_description: str) -> str:
+        # Another provider or model gives a different analysis, so it is part of the key
+        config = self.llm_config.for_agent("job_analyzer")
+        return hashlib.sha256(
+            f"{config.provider}\0{config.model_name}\0{job_description}".encode("utf-8")).hexdigest()
+
+    def _load_jd_cache(self) -> Dict[str, str]:
+        """Load persisted job description analyses, empty if there are none"""
+        try:
+            with open(self._jd_cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _store_job_analysis(self, key: str, analysis: str):
+        """Remember a job description analysis and persist it for later runs"""
+        with self._jd_cache_lock:
+            self._jd_cache[key] = analysis
+            cache_dir = os.path.dirname(self._jd_cache_path) or "."
+            try:
+                os.makedirs(cache_dir, exist_ok=True)
+                # Written to a temp file and renamed, so readers never see a partial file
+                fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(self._jd_cache, f, indent=2)
+                os.replace(tmp_path, self._jd_cache_path)
+            except OSError:
+                pass  # The in-memory cache still serves this process
+
+    def clear_jd_cache(self):
+        """Forget all cached job description analyses (e.g. after editing a job description)"""
+        with self._jd_cache_lock:
+            self._jd_cache.clear()
+        try:
+            os.remove(self._jd_cache_path)
+        except FileNotFoundError:
+            pass
+
+    def _json_guardrail(self, agent: Agent, escalate_to: str = "matcher"):
+        """Task guardrail for JSON extraction tasks run on a small model
         
-        # 6. Report generator agent
-        self.report_generator = Agent(
-            role="Report Generator",
-            goal="Create comprehensive, readable reports on candidate suitability",
-            backstory="""You transform complex data into actionable insights and 
-            recommendations. You create clear, structured reports that highlight
-            key findings about candidates. You excel at visualizing data and
-            presenting information in an accessible format. Your reports help
-            recruiters and hiring managers make informed decisions quickly.""",
-            allow_delegation=False,
-            llm=self._get_llm("report_generator")
+        When the output is not valid JSON, the agent is switched to the LLM of
+        `escalate_to` and the task is retried once; that answer is accepted as is.
+        """
+        escalated = False
+        
+        def guardrail(output) -> Tuple[bool, Any]:
+            nonlocal escalated
+            if escalated or _is_json_output(output.raw):
+                return True, output.raw
+            agent.llm = self._get_llm(escalate_to)
+            escalated = True
+            return False, "The answer must be a single valid JSON object."
+        
+        return guardrail
+    
+    def _create_job_analysis_task(self, job_description: str, job_analyzer_agent: Agent,
+                                  async_execution: bool = False) -> Task:
+        """Create the task that extracts structured requirements from a job description
+        
+        Its output is added to the job description cache once the task completes.
+        """
+        key = self._jd_cache_key(job_description)
+        return Task(
+            description=f"{JOB_ANALYZER_INSTRUCTIONS}\n\nJob description:\n{job_description}",
+            agent=job_analyzer_agent,
+            expected_output="A structured JSON object containing categorized and prioritized job requirements.",
+            async_execution=async_execution,
+            guardrail=self._json_guardrail(job_analyzer_agent),
+            callback=lambda output: self._store_job_analysis(key, output.raw)
         )
+
+    def create_tasks(self, resume_path: str, job_description: str, agents_list: List[Agent], # Renamed agents to agents_list for clarity
+                     job_analysis: Optional[str] = None):
+        """Create tasks for resume screening
         
-        # 7. Feedback processor agent
-        self.feedback_processor = FeedbackProcessorAgent(self._get_llm("feedback_processor"))
-        
-        return [
-            self.document_processor,
-            self.resume_analyzer,
-            self.job_analyzer,
-            self.researcher,
-            self.matcher,
-            self.report_generator,
-            self.feedback_processor
-        ]
-
-    def create_tasks(self, resume_path: str, job_description: str, agents_list: List[Agent]): # Renamed agents to agents_list for clarity
-        """Create tasks for resume screening"""
+        If job_analysis (the output of a previous job analyzer run) is given or the
+        job description was analyzed before, the job description is not analyzed
+        again and the analysis is passed to the matcher and report tasks directly.
+        """
         # Validate resume file exists
         if not os.path.exists(resume_path):
             raise FileNotFoundError(f"Resume file not found at: {resume_path}")
@@ -166,166 +557,188 @@ class ResumeScreeningAgents:
         researcher_agent, matcher_agent, report_generator_agent, \
         _ = agents_list # feedback_processor_agent not directly used in these default tasks
         
-        return [
-            # Task 1: Process the resume document
-            Task(
-                description=f"""Process the resume at {resume_path}.
-                Extract key information including:
-                - Personal information (name, contact details)
-                - Technical skills and proficiency levels
-                - Work experience and responsibilities
-                - Education and certifications
-                - Projects and achievements
-                
-                If it's a PDF, use PyMuPDF concepts.
-                If it's a DOCX, use python-docx concepts.
-                If it's HTML, use BeautifulSoup concepts.
-                If it's TXT, use standard text processing.
-                
-                Format the output as a structured JSON object with clear hierarchical organization.""",
-                agent=doc_processor_agent,
-                expected_output="A structured JSON object containing all relevant information from the resume."
-            ),
-            
-            # Task 2: Analyze the job description
-            Task(
-                description=f"""Analyze the following job description:
-                {job_description}
-                
-                Extract and classify requirements as:
-                1. Mandatory skills/qualifications
-                2. Preferred/nice-to-have skills
-                3. Experience requirements (with minimum years if specified)
-                4. Education requirements
-                5. Soft skills and personal attributes
-                
-                Prioritize the requirements based on their importance and prominence in the description.
-                Format your output as a structured JSON with clear categorization and priority levels.""",
-                agent=job_analyzer_agent,
-                expected_output="A structured JSON object containing categorized and prioritized job requirements."
-            ),
-            
-            # Task 3: Analyze the candidate's skills and experience
-            Task(
-                description="""Analyze the technical skills and experience extracted from the resume.
-                For each skill mentioned:
-                - Validate the skill against current industry standards
-                - Assess the depth of experience
-                - Check for relevant certifications
-                - Look for practical applications in projects
-                
-                Calculate the total years of experience in relevant positions.
-                Classify the experience by categories (e.g., frontend, backend, DevOps).
-                Identify the candidate's areas of specialization.
-                
-                Provide a detailed analysis with confidence scores for each skill assessment.""",
-                agent=resume_analyzer_agent,
-                expected_output="A detailed analysis of skills with confidence scores and experience metrics."
-            ),
-            
-            # Task 4: Research the candidate
-            Task(
-                description="""Research and verify the candidate's background:
-                - Verify listed companies and positions
-                - Look for public work (GitHub, technical blogs, etc.)
-                - Find additional projects or contributions
-                - Check for relevant industry presence
-                - Look for social media profiles that might provide additional insights
-                
-                Focus on professional information that validates or enhances what's in the resume.
-                Compile findings into a comprehensive report, clearly distinguishing between
-                verified information and potential matches that need confirmation.""",
-                agent=researcher_agent,
-                expected_output="A comprehensive report on the candidate's online presence and additional information."
-            ),
-            
-            # Task 5: Calculate match score and evaluate
-            Task(
-                description="""Analyze all gathered information and calculate a match score:
-                1. Compare the candidate's skills and experience against the job requirements
-                2. Weigh mandatory requirements more heavily than preferred ones
-                3. Give special attention to years of experience in relevant positions
-                4. Consider certifications, education, and project experience
-                5. Factor in insights from online research
-                
-                Provide a final evaluation including:
-                1. Overall match score (0-100)
-                2. Sub-scores for different requirement categories
-                3. Key strengths
-                4. Potential areas of concern
-                5. Hiring recommendation
-                6. Suggested interview focus areas
-                
-                ВАЖЛИВО: У кінці відповіді окремим рядком напиши: Total Match Score: NN, де NN — реальне число від 0 до 100, яке ти розрахував на основі аналізу. Не використовуй XX, не залишай це поле порожнім, обов'язково підстав реальне число.
-                IMPORTANT: At the end of your answer, write a separate line: Total Match Score: NN, where NN is a real number from 0 to 100 that you calculated. Do NOT use XX, do NOT leave it blank, always provide a real number.
-                Example:
-                ...
-                Total Match Score: 87
-                """,
-                agent=matcher_agent,
-                expected_output="A detailed match evaluation with scores, strengths, concerns, and recommendations."
-            ),
-            
-            # Task 6: Generate comprehensive report
-            Task(
-                description="""Generate a comprehensive report based on all previous analyses:
-                1. Executive summary with key findings and recommendation
-                2. Candidate profile overview
-                3. Skills assessment visualization
-                4. Experience timeline
-                5. Match analysis with detailed scoring
-                6. Online presence summary
-                7. Areas for further exploration in interviews
-                8. Final recommendation
-                
-                Format the report in a clean, professional structure with clear sections.
-                Use markdown formatting for better readability.
-                
-                ВАЖЛИВО: Використовуй реальні результати попередніх агентів (аналіз навичок, досвіду, job description, оцінку matcher) для формування звіту. Не описуй процес, а генеруй реальний звіт з оцінками та числовим Total Match Score. У кінці звіту окремим рядком напиши: Total Match Score: XX (де XX — число від 0 до 100, яке ти розрахував у попередньому кроці).
-                """,
-                agent=report_generator_agent,
-                expected_output="A comprehensive, well-structured final report in markdown format."
-            ),
-            
-            # Task 7: Request feedback (simulated for CLI, real for UI)
-            # This task is more of a placeholder for the CLI flow. 
-            # The actual feedback processing is handled by FeedbackProcessorAgent
-            # when feedback is submitted through the UI.
-            Task(
-                description="""This is a placeholder task for the CLI. 
-                In the UI, user feedback is processed separately by the FeedbackProcessorAgent.
-                For CLI runs, this task simply notes that feedback would be collected in an interactive scenario.""",
-                agent=self.feedback_processor, # Assign to an agent, even if it's just a note
-                expected_output="A note indicating that feedback processing is typically handled via UI or a dedicated interactive step."
-            )
-        ]
+        # Task 1: Process the resume document
+        doc_task = Task(
+            description=f"{DOC_PROCESSOR_INSTRUCTIONS}\n\nResume file: {resume_path}",
+            agent=doc_processor_agent,
+            expected_output="A structured JSON object containing all relevant information from the resume.",
+            guardrail=self._json_guardrail(doc_processor_agent)
+        )
+        
+        # Tasks 2-4 only depend on the job description or the processed resume,
+        # so they run concurrently and fan in at the matcher.
+        
+        # Task 2: Analyze the job description (skipped when an analysis is supplied or cached)
+        if job_analysis is None:
+            job_analysis = self._jd_cache.get(self._jd_cache_key(job_description))
+        jd_task = None
+        job_analysis_note = ""
+        if job_analysis is None:
+            jd_task = self._create_job_analysis_task(job_description, job_analyzer_agent, async_execution=True)
+        else:
+            job_analysis_note = f"\n\nJob requirements analysis:\n{job_analysis}"
+        
+        # Task 3: Analyze the candidate's skills and experience
+        skills_task = Task(
+            description=SKILLS_ANALYZER_INSTRUCTIONS,
+            agent=resume_analyzer_agent,
+            expected_output="A detailed analysis of skills with confidence scores and experience metrics.",
+            context=[doc_task],
+            async_execution=True
+        )
+        
+        # Task 4: Research the candidate
+        research_task = Task(
+            description=RESEARCHER_INSTRUCTIONS,
+            agent=researcher_agent,
+            expected_output="A comprehensive report on the candidate's online presence and additional information.",
+            context=[doc_task],
+            async_execution=True
+        )
+        
+        # Task 5: Calculate match score and evaluate
+        analysis_tasks = [t for t in (doc_task, jd_task, skills_task, research_task) if t is not None]
+        match_task = Task(
+            description=MATCHER_INSTRUCTIONS + job_analysis_note,
+            agent=matcher_agent,
+            expected_output="A detailed match evaluation with scores, strengths, concerns, and recommendations.",
+            context=analysis_tasks
+        )
+        
+        # Task 6: Generate comprehensive report
+        report_task = Task(
+            description=REPORT_GENERATOR_INSTRUCTIONS + job_analysis_note,
+            agent=report_generator_agent,
+            expected_output="A comprehensive, well-structured final report in markdown format.",
+            context=analysis_tasks + [match_task]
+        )
+        
+        # Task 7: Request feedback (simulated for CLI, real for UI)
+        # This task is more of a placeholder for the CLI flow. 
+        # The actual feedback processing is handled by FeedbackProcessorAgent
+        # when feedback is submitted through the UI.
+        feedback_task = Task(
+            description=FEEDBACK_PLACEHOLDER_INSTRUCTIONS,
+            agent=self.feedback_processor, # Assign to an agent, even if it's just a note
+            expected_output="A note indicating that feedback processing is typically handled via UI or a dedicated interactive step."
+        )
+        
+        tasks = [doc_task, jd_task, skills_task, research_task, match_task, report_task, feedback_task]
+        return [task for task in tasks if task is not None]
 
     def create_crew(self, resume_path: Optional[str] = None, job_description: Optional[str] = None, 
                       agents: Optional[List[Agent]] = None, tasks: Optional[List[Task]] = None, 
-                      process: Process = Process.sequential, verbose: bool = True):
-        """Create and configure the crew for resume screening or other tasks"""
+                      process: Process = Process.sequential, verbose: bool = True,
+                      max_rpm: Optional[int] = None, job_analysis: Optional[str] = None,
+                      stream: bool = False, use_graph: bool = False,
+                      task_callback: Optional[Callable[[Any], None]] = None):
+        """Create and configure the crew for resume screening or other tasks
+        
+        max_rpm caps LLM requests per minute across all agents, which keeps the
+        concurrently running tasks within the provider's rate limit.
+        use_graph=True returns a ScreeningGraph for the default screening run,
+        which calls the agents' LLMs directly and has the same kickoff interface.
+        task_callback is called with each task's output as it finishes.
+        """
+        
+        if use_graph and (agents is None or tasks is None):
+            if resume_path is None or job_description is None:
+                raise ValueError("Resume path and job description are required for default screening crew.")
+            from screening_graph import ScreeningGraph
+            return ScreeningGraph(self, resume_path, job_description, job_analysis,
+                                  stream=stream, task_callback=task_callback)
         
         # If agents and tasks are not provided, create default screening crew
         if agents is None or tasks is None:
             if resume_path is None or job_description is None:
                 raise ValueError("Resume path and job description are required for default screening crew.")
             
-            created_agents = self.create_agents()
-            created_tasks = self.create_tasks(resume_path, job_description, created_agents)
+            created_agents = self.create_agents(
+                stream=stream, cache_scope=self.semantic_cache_scope(resume_path, job_description))
+            created_tasks = self.create_tasks(resume_path, job_description, created_agents, job_analysis)
         else:
             created_agents = agents
             created_tasks = tasks
+        
+        if task_callback is not None:
+            # crewAI gives task_callback only to tasks without a callback of their own
+            for task in created_tasks:
+                if task.callback:
+                    task.callback = _chain_callbacks(task.callback, task_callback)
             
         crew = Crew(
             agents=created_agents,
             tasks=created_tasks,
             process=process,
-            verbose=verbose
+            verbose=verbose,
+            max_rpm=max_rpm,
+            task_callback=task_callback
         )
         
         return crew
 
+    def analyze_job_description(self, job_description: str) -> str:
+        """Run the job analyzer on its own and return the structured requirements"""
+        cached = self._jd_cache.get(self._jd_cache_key(job_description))
+        if cached is not None:
+            return cached
+        
+        job_analyzer_agent = self.create_agent("job_analyzer")
+        jd_task = self._create_job_analysis_task(job_description, job_analyzer_agent)
+        crew = self.create_crew(agents=[job_analyzer_agent], tasks=[jd_task], verbose=False)
+        return crew.kickoff().raw
+
+    async def screen_batch(self, resume_paths: List[str], job_description: str,
+                           max_concurrency: int = 4) -> List[Any]:
+        """Screen several resumes against one job description concurrently
+        
+        The job description is analyzed once and shared by every per-resume crew;
+        at most max_concurrency crews run at the same time.
+        Returns the crew outputs in the order of resume_paths.
+        """
+        job_analysis = await asyncio.to_thread(self.analyze_job_description, job_description)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def screen(resume_path: str):
+            async with semaphore:
+                crew = self.create_crew(resume_path, job_description, verbose=False,
+                                        job_analysis=job_analysis)
+                return await crew.kickoff_async()
+        
+        return await asyncio.gather(*(screen(path) for path in resume_paths))
+
+# Report sections worth quoting to the feedback processor
+_SALIENT_SECTION_RE = re.compile(r'executive summary|total match score', re.IGNORECASE)
+
+_REPORT_SNIPPET_CHARS = 1000
+
+# Entries kept in each FeedbackProcessorAgent memo, least recently used dropped first
+_FEEDBACK_MEMO_SIZE = 256
+
+def _memo_get(memo: "OrderedDict[str, str]", key: str) -> Optional[str]:
+    """Look key up in an LRU memo, marking it as recently used"""
+    value = memo.get(key)
+    if value is not None:
+        memo.move_to_end(key)
+    return value
+
+def _memo_put(memo: "OrderedDict[str, str]", key: str, value: str):
+    """Store key in an LRU memo, evicting the least recently used entry beyond _FEEDBACK_MEMO_SIZE"""
+    memo[key] = value
+    memo.move_to_end(key)
+    if len(memo) > _FEEDBACK_MEMO_SIZE:
+        memo.popitem(last=False)
+
+def _digest(*parts: str) -> str:
+    """SHA-256 over parts, NUL-separated so ("ab", "c") and ("a", "bc") differ"""
+    return hashlib.sha256("\0".join(parts).encode("utf-8")).hexdigest()
+
 class FeedbackProcessorAgent(Agent):
+    # Report snippets keyed by the SHA-256 of the report, analyses by that of feedback and report;
+    # both are LRU-bounded to _FEEDBACK_MEMO_SIZE entries
+    _snippets: "OrderedDict[str, str]" = PrivateAttr(default_factory=OrderedDict)
+    _analyses: "OrderedDict[str, str]" = PrivateAttr(default_factory=OrderedDict)
+
     def __init__(self, llm):
         super().__init__(
             role="Feedback Processor",
@@ -340,11 +753,42 @@ class FeedbackProcessorAgent(Agent):
             # verbose=True # Uncomment for detailed logging during development
         )
 
+    def _report_snippet(self, original_report: str) -> str:
+        """Pick the report chunk with the executive summary or score instead of a blind prefix"""
+        report_key = _digest(original_report)
+        cached = _memo_get(self._snippets, report_key)
+        if cached is not None:
+            return cached
+        
+        snippet = original_report[:_REPORT_SNIPPET_CHARS]
+        if RecursiveCharacterTextSplitter is not None:
+            splitter = RecursiveCharacterTextSplitter(
+                chunk_size=_REPORT_SNIPPET_CHARS,
+                chunk_overlap=0,
+                separators=["\n## ", "\n### ", "\n\n", "\n", " "]
+            )
+            for chunk in splitter.split_text(original_report):
+                if _SALIENT_SECTION_RE.search(chunk):
+                    snippet = chunk
+                    break
+        
+        _memo_put(self._snippets, report_key, snippet)
+        return snippet
+
+    def cached_analysis(self, feedback_data: str, original_report: str) -> Optional[str]:
+        """Return the analysis of identical feedback on the same report, if it was processed before"""
+        return _memo_get(self._analyses, _digest(feedback_data, original_report))
+
     def process_feedback_task(self, feedback_data: str, original_report: str) -> Task:
+        key = _digest(feedback_data, original_report)
+        
+        def remember(output):
+            _memo_put(self._analyses, key, output.raw)
+        
         return Task(
             description=f"""Analyze the following user feedback regarding a candidate report:
             User Feedback: {feedback_data}
-            Original Report Snippet: {original_report[:1000]}...
+            Original Report Snippet: {self._report_snippet(original_report)}...
 
             Identify key areas of concern or praise in the feedback.
             Suggest specific, actionable improvements for the resume analysis process, 
@@ -352,5 +796,6 @@ class FeedbackProcessorAgent(Agent):
             Consider if the feedback points to issues with specific agent performance or data extraction.
             """,
             agent=self,
-            expected_output="A structured analysis of the feedback, including: \n1. Summary of feedback points. \n2. Identified patterns or recurring issues. \n3. Actionable suggestions for system improvement (e.g., adjustments to specific agent prompts, parsing logic, or scoring weights). \n4. Potential impact of implementing the suggested improvements." 
+            expected_output="A structured analysis of the feedback, including: \n1. Summary of feedback points. \n2. Identified patterns or recurring issues. \n3. Actionable suggestions for system improvement (e.g., adjustments to specific agent prompts, parsing logic, or scoring weights). \n4. Potential impact of implementing the suggested improvements.",
+            callback=remember
         ) 
\ No newline at end of file
@@ -3,17 +3,111 @@ Analysis Manager for handling resume analysis reports and comparisons.
 """
 
 import os
+import re
 import json
-import glob
+import sqlite3
+import heapq
+import hashlib
+import tempfile
 import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from collections import defaultdict
+from contextlib import closing
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple, Set, Callable
+
+# Faster JSON backends (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Compressed .json.zst reports (optional)
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+_ZST_SUFFIX = ".json.zst"
+
+# parsed_resume fields kept in reports; full_text and any other bulky fields are dropped
+_REPORT_RESUME_FIELDS = ("name", "contact_information", "skills", "education", "work_experience")
+
+# Parsed resumes are stored once per content hash in this directory next to the reports
+_RESUMES_DIRNAME = "resumes"
+
+# Report loading is I/O-bound, so a thread pool overlaps the disk reads
+_LOAD_WORKERS = 16
+
+# Keyword index over report job descriptions, stored next to the reports
+_INDEX_FILENAME = ".reports_index.db"
+
+# Analysis results reused for identical inputs, stored next to the reports
+_ANALYSIS_CACHE_DIRNAME = ".cache"
+
+def _check_fts() -> bool:
+    """Check whether SQLite supports FTS5 with the trigram tokenizer (SQLite 3.34+)"""
+    try:
+        with closing(sqlite3.connect(":memory:")) as conn:
+            conn.execute("CREATE VIRTUAL TABLE t USING fts5(x, tokenize='trigram')")
+        return True
+    except sqlite3.Error:
+        return False
+
+_fts_available = _check_fts()
+
+# Score patterns like "Score: 85/100" or "Match: 85%"
+_SCORE_RE = re.compile(r'(\d{1,3})\s*/\s*100|(?:score|match)\s*:\s*(\d{1,3})', re.IGNORECASE)
+
+def _extract_score(analysis: Any) -> int:
+    """Extract a match score from analysis text or a structured analysis result, 0 if none is found"""
+    if isinstance(analysis, dict):
+        # The final task output comes first, then the earlier tasks from last to first
+        texts = [analysis.get("raw") or ""] + list(reversed(analysis.get("tasks", [])))
+    else:
+        texts = [analysis]
+    for text in texts:
+        score_match = _SCORE_RE.search(text or "")
+        if score_match:
+            try:
+                return int(score_match.group(1) or score_match.group(2))
+            except ValueError:
+                pass
+    return 0
+
+def _serialize_result(result: Any) -> Any:
+    """Keep the structure of a CrewAI CrewOutput; other results are stored as text"""
+    if isinstance(result, dict):
+        return result  # Already serialized, e.g. a cached analysis
+    if hasattr(result, "tasks_output"):
+        token_usage = result.token_usage
+        return {
+            "raw": result.raw,
+            "tasks": [t.raw for t in result.tasks_output],
+            "token_usage": token_usage.model_dump() if hasattr(token_usage, "model_dump") else dict(token_usage or {})
+        }
+    return str(result)
+
+def analysis_cache_key(parsed_resume: Dict, job_description: str, llm_config: Any) -> str:
+    """SHA-256 of the inputs that determine an analysis: parsed resume, job description and LLMConfig"""
+    canonical_json = json.dumps(
+        {"resume": parsed_resume, "jd": job_description, "llm": llm_config.model_dump()},
+        sort_keys=True, default=str
+    )
+    return hashlib.sha256(canonical_json.encode("utf-8")).hexdigest()
 
 class AnalysisManager:
     """Manager for resume analysis reports"""
     
-    def __init__(self, reports_dir: str = "reports"):
-        """Initialize with reports directory"""
+    def __init__(self, reports_dir: str = "reports", compress: bool = False):
+        """Initialize with reports directory; compress=True saves new reports as zstd-compressed .json.zst"""
         self.reports_dir = reports_dir
+        self.compress = compress and zstandard is not None
         os.makedirs(reports_dir, exist_ok=True)
     
     def save_report(self, result: Any, parsed_resume: Dict, job_description: str, 
@@ -23,47 +117,257 @@ class AnalysisManager:
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         
         # Use provided output path or generate default filename
+        explicit_path = bool(output_path)
         if output_path:
-            # Ensure it has .json extension
-            if not output_path.endswith('.json'):
+            # Ensure it has .json (or .json.zst) extension
+            if not output_path.endswith(('.json', _ZST_SUFFIX)):
                 output_path += '.json'
         else:
             candidate_name = parsed_resume.get('name', 'unknown').replace(' ', '_').lower()
-            output_path = os.path.join(self.reports_dir, f"{candidate_name}_{timestamp}.json")
+            extension = _ZST_SUFFIX if self.compress else '.json'
+            output_path = os.path.join(self.reports_dir, f"{candidate_name}_{timestamp}{extension}")
         
-        # Prepare data to save
+        # Reports in reports_dir share the resume store there; a report written to an
+        # explicit path elsewhere keeps its resume inline so it stays self-contained
+        resume = {k: parsed_resume[k] for k in _REPORT_RESUME_FIELDS if k in parsed_resume}
+        if explicit_path:
+            resume_key, resume_value = "parsed_resume", resume
+        else:
+            resume_key, resume_value = "parsed_resume_ref", self._store_resume(resume)
+        
+        # Prepare data to save; the score is extracted once here so readers need not parse the analysis
+        analysis_result = _serialize_result(result)
         data = {
             "timestamp": timestamp,
             "candidate_name": parsed_resume.get('name'),
-            "parsed_resume": {k: v for k, v in parsed_resume.items() if k != 'full_text'},
+            "match_score": _extract_score(analysis_result),
+            resume_key: resume_value,
             "job_description": job_description,
-            "analysis_result": str(result)
+            "analysis_result": analysis_result
         }
         
         # Save to file
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2)
+        if output_path.endswith(_ZST_SUFFIX):
+            if zstandard is None:
+                raise ValueError("Saving .json.zst reports requires the zstandard package")
+            payload = orjson.dumps(data) if orjson is not None else json.dumps(data).encode('utf-8')
+            with open(output_path, 'wb') as f:
+                f.write(zstandard.ZstdCompressor(level=3).compress(payload))
+        elif orjson is not None:
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
         
+        self._index_report(output_path, job_description)
         return output_path
     
+    def load_cached_analysis(self, key: str) -> Any:
+        """The analysis result cached under key (see analysis_cache_key), or None if there is none
+        
+        Results are kept in the form save_report stores, so a CrewOutput comes back as a
+        dict with "raw", "tasks" and "token_usage".
+        """
+        try:
+            return self._read_json(os.path.join(self.reports_dir, _ANALYSIS_CACHE_DIRNAME, f"{key}.json"))["result"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+    
+    def store_cached_analysis(self, key: str, result: Any):
+        """Cache an analysis result under key; best effort"""
+        cache_dir = os.path.join(self.reports_dir, _ANALYSIS_CACHE_DIRNAME)
+        entry = {"created": datetime.datetime.now().isoformat(), "result": _serialize_result(result)}
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # Written to a temp file and renamed, so a later run never reads a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(orjson.dumps(entry) if orjson is not None else json.dumps(entry).encode("utf-8"))
+            os.replace(tmp_path, os.path.join(cache_dir, f"{key}.json"))
+        except (OSError, TypeError, ValueError):
+            pass
+    
+    def cached_analysis(self, key: str, run: Callable[[], Any], refresh: bool = False) -> Any:
+        """Return the result cached under key, or call run() and cache what it returns"""
+        if not refresh:
+            cached = self.load_cached_analysis(key)
+            if cached is not None:
+                return cached
+        result = run()
+        self.store_cached_analysis(key, result)
+        return result
+    
+    def _store_resume(self, resume: Dict) -> str:
+        """
+        Store a parsed resume under its content hash in reports_dir unless it is already there
+        Returns: the hash, which the report keeps as parsed_resume_ref
+        """
+        if orjson is not None:
+            payload = orjson.dumps(resume, option=orjson.OPT_SORT_KEYS)
+        else:
+            payload = json.dumps(resume, sort_keys=True).encode('utf-8')
+        resume_hash = hashlib.sha256(payload).hexdigest()
+        
+        resumes_dir = os.path.join(self.reports_dir, _RESUMES_DIRNAME)
+        base_path = os.path.join(resumes_dir, resume_hash)
+        if os.path.exists(base_path + _ZST_SUFFIX) or os.path.exists(base_path + '.json'):
+            return resume_hash
+        
+        os.makedirs(resumes_dir, exist_ok=True)
+        # Skills sidecar first, so an existing resume file implies the sidecar exists too
+        with open(base_path + '.skills.json', 'w', encoding='utf-8') as f:
+            json.dump(resume.get('skills', []), f)
+        if zstandard is not None:
+            with open(base_path + _ZST_SUFFIX, 'wb') as f:
+                f.write(zstandard.ZstdCompressor(level=3).compress(payload))
+        else:
+            with open(base_path + '.json', 'wb') as f:
+                f.write(payload)
+        return resume_hash
+    
+    def _load_resume(self, report_path: str, resume_hash: str) -> Dict:
+        """Load a parsed resume stored by _store_resume, which sits beside reports that reference it"""
+        base_path = os.path.join(os.path.dirname(report_path), _RESUMES_DIRNAME, resume_hash)
+        if os.path.exists(base_path + _ZST_SUFFIX):
+            return self._read_json(base_path + _ZST_SUFFIX)
+        return self._read_json(base_path + '.json')
+    
+    def _load_resume_skills(self, report_path: str, resume_hash: str) -> List[str]:
+        """Read only the skills of a stored resume from its sidecar file"""
+        sidecar = os.path.join(os.path.dirname(report_path), _RESUMES_DIRNAME, resume_hash + '.skills.json')
+        try:
+            return self._read_json(sidecar)
+        except OSError:
+            return self._load_resume(report_path, resume_hash).get('skills', [])
+    
+    @staticmethod
+    def _read_json(file_path: str) -> Any:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if file_path.endswith(_ZST_SUFFIX):
+            if zstandard is None:
+                raise ValueError("Reading .json.zst files requires the zstandard package")
+            data = zstandard.ZstdDecompressor().decompress(data)
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    
     def load_report(self, file_path: str) -> Dict:
-        """Load an analysis report from a JSON file"""
+        """Load an analysis report from a JSON file, including its parsed resume"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            report = self._read_json(file_path)
+            if "parsed_resume_ref" in report and "parsed_resume" not in report:
+                report["parsed_resume"] = self._load_resume(file_path, report["parsed_resume_ref"])
+            return report
         except Exception as e:
             raise ValueError(f"Failed to load report {file_path}: {str(e)}")
     
+    def load_report_fields(self, file_path: str, fields: Set[str]) -> Dict:
+        """
+        Load only the given top-level fields of a report
+        With ijson installed the file is streamed and parsing stops once all
+        fields are found, skipping large values such as the analysis text
+        """
+        if ijson is None:
+            report = self.load_report(file_path)
+            return {k: v for k, v in report.items() if k in fields}
+        
+        try:
+            report = {}
+            with open(file_path, 'rb') as f:
+                stream = zstandard.ZstdDecompressor().stream_reader(f) if file_path.endswith(_ZST_SUFFIX) else f
+                for key, value in ijson.kvitems(stream, ''):
+                    if key in fields:
+                        report[key] = value
+                        if len(report) == len(fields):
+                            break
+            return report
+        except Exception as e:
+            raise ValueError(f"Failed to load report {file_path}: {str(e)}")
+    
+    def _load_reports(self, report_paths: List[str], fields: Optional[Set[str]] = None) -> List[Tuple[str, Any]]:
+        """
+        Load several reports concurrently, optionally only the given fields
+        Returns: List of (report_path, report) tuples in input order; a report
+        that fails to load is replaced by the raised exception
+        """
+        def load(path):
+            try:
+                if fields is not None:
+                    return self.load_report_fields(path, fields)
+                return self.load_report(path)
+            except Exception as e:
+                return e
+        
+        with ThreadPoolExecutor(max_workers=_LOAD_WORKERS) as executor:
+            return list(zip(report_paths, executor.map(load, report_paths)))
+    
     def list_reports(self) -> List[str]:
         """List all report files in the reports directory"""
-        return glob.glob(os.path.join(self.reports_dir, "*.json"))
+        # scandir avoids the per-entry stat calls of glob; hidden files are skipped like glob does
+        with os.scandir(self.reports_dir) as entries:
+            return [entry.path for entry in entries
+                    if entry.name.endswith((".json", _ZST_SUFFIX)) and not entry.name.startswith(".") and entry.is_file()]
+    
+    def _connect_index(self) -> sqlite3.Connection:
+        """Open the keyword index, creating its table if needed"""
+        conn = sqlite3.connect(os.path.join(self.reports_dir, _INDEX_FILENAME))
+        # Job descriptions are stored lowercased so LIKE matches exactly like str.lower() substring checks
+        conn.execute("CREATE VIRTUAL TABLE IF NOT EXISTS reports_fts "
+                     "USING fts5(path UNINDEXED, job_description, tokenize='trigram')")
+        return conn
+    
+    def _index_report(self, report_path: str, job_description: str):
+        """Add or replace a report in the keyword index"""
+        if not _fts_available:
+            return
+        try:
+            with closing(self._connect_index()) as conn, conn:
+                conn.execute("DELETE FROM reports_fts WHERE path = ?", (report_path,))
+                conn.execute("INSERT INTO reports_fts(path, job_description) VALUES (?, ?)",
+                             (report_path, (job_description or "").lower()))
+        except sqlite3.Error:
+            # The index is only an accelerator; get_reports_for_job resyncs it
+            pass
+    
+    def _sync_index(self, conn: sqlite3.Connection):
+        """Index reports written outside save_report and drop deleted ones"""
+        on_disk = set(self.list_reports())
+        indexed = {row[0] for row in conn.execute("SELECT path FROM reports_fts")}
+        
+        stale = indexed - on_disk
+        if stale:
+            conn.executemany("DELETE FROM reports_fts WHERE path = ?", [(p,) for p in stale])
+        
+        new_reports = self._load_reports(sorted(on_disk - indexed), {"job_description"})
+        conn.executemany(
+            "INSERT INTO reports_fts(path, job_description) VALUES (?, ?)",
+            [(path, report.get("job_description", "").lower())
+             for path, report in new_reports
+             if isinstance(report, dict) and isinstance(report.get("job_description", ""), str)]
+        )
+    
+    def _query_index(self, job_keyword: str) -> List[str]:
+        """Find matching reports through the keyword index"""
+        pattern = "%" + job_keyword.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        with closing(self._connect_index()) as conn, conn:
+            self._sync_index(conn)
+            rows = conn.execute("SELECT path FROM reports_fts WHERE job_description LIKE ? ESCAPE '\\'",
+                                (pattern,))
+            return [row[0] for row in rows]
     
     def get_reports_for_job(self, job_keyword: str) -> List[str]:
         """Find reports that match a specific job keyword"""
+        if _fts_available:
+            try:
+                return self._query_index(job_keyword)
+            except sqlite3.Error:
+                pass  # Fall back to scanning the report files
+        
         matching_reports = []
-        for report_path in self.list_reports():
+        for report_path, report in self._load_reports(self.list_reports(), {"job_description"}):
             try:
-                report = self.load_report(report_path)
+                if isinstance(report, Exception):
+                    raise report
                 if job_keyword.lower() in report.get("job_description", "").lower():
                     matching_reports.append(report_path)
             except Exception:
@@ -78,26 +382,17 @@ class AnalysisManager:
         """
         results = []
         
-        for path in report_paths:
+        for path, report in self._load_reports(report_paths, {"candidate_name", "match_score"}):
             try:
-                report = self.load_report(path)
+                if isinstance(report, Exception):
+                    raise report
                 name = report.get("candidate_name", "Unknown")
                 
-                # Try to extract match score from analysis result
-                analysis = report.get("analysis_result", "")
-                
-                # Look for patterns like "Score: 85/100" or "Match: 85%"
-                import re
-                score_match = re.search(r'(\d{1,3})(?:\s*)?\/(?:\s*)?100|(?:score|match)(?:\s*)?:(?:\s*)?(\d{1,3})', 
-                                      analysis, re.IGNORECASE)
-                
-                score = 0
-                if score_match:
-                    matched_score = score_match.group(1) or score_match.group(2)
-                    try:
-                        score = int(matched_score)
-                    except ValueError:
-                        pass
+                score = report.get("match_score")
+                if score is None:
+                    # Reports saved before match_score was stored: parse the analysis text
+                    analysis = self.load_report_fields(path, {"analysis_result"}).get("analysis_result", "")
+                    score = _extract_score(analysis)
                 
                 results.append((name, score, path))
             except Exception:
@@ -123,10 +418,15 @@ class AnalysisManager:
             "timestamp": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
-        # Process each report
-        for path in report_paths:
+        skill_comparison = defaultdict(list)
+        ranking = []
+        
+        # Process each report; stored resumes are not loaded, only their skills sidecars
+        fields = {"job_description", "candidate_name", "match_score", "parsed_resume", "parsed_resume_ref"}
+        for path, report in self._load_reports(report_paths, fields):
             try:
-                report = self.load_report(path)
+                if isinstance(report, Exception):
+                    raise report
                 
                 # Save job description (should be same for all if comparing for same job)
                 if not comparison["job_description"]:
@@ -135,21 +435,16 @@ class AnalysisManager:
                 name = report.get("candidate_name", "Unknown")
                 
                 # Extract skills
-                skills = report.get("parsed_resume", {}).get("skills", [])
-                
-                # Extract match score using regex
-                analysis = report.get("analysis_result", "")
-                import re
-                score_match = re.search(r'(\d{1,3})(?:\s*)?\/(?:\s*)?100|(?:score|match)(?:\s*)?:(?:\s*)?(\d{1,3})', 
-                                      analysis, re.IGNORECASE)
+                if "parsed_resume_ref" in report:
+                    skills = self._load_resume_skills(path, report["parsed_resume_ref"])
+                else:
+                    skills = report.get("parsed_resume", {}).get("skills", [])
                 
-                score = 0
-                if score_match:
-                    matched_score = score_match.group(1) or score_match.group(2)
-                    try:
-                        score = int(matched_score)
-                    except ValueError:
-                        pass
+                # Use the stored match score, parsing the analysis only for older reports
+                score = report.get("match_score")
+                if score is None:
+                    analysis = self.load_report_fields(path, {"analysis_result"}).get("analysis_result", "")
+                    score = _extract_score(analysis)
                 
                 # Add to candidates list
                 candidate_info = {
@@ -159,12 +454,11 @@ class AnalysisManager:
                     "report_path": path
                 }
                 comparison["candidates"].append(candidate_info)
+                ranking.append((name, score))
                 
                 # Add skills to skill comparison
                 for skill in skills:
-                    if skill not in comparison["skill_comparison"]:
-                        comparison["skill_comparison"][skill] = []
-                    comparison["skill_comparison"][skill].append(name)
+                    skill_comparison[skill].append(name)
                 
                 # Update highest match if applicable
                 if score > comparison["scoring"]["highest_match"]["score"]:
@@ -174,12 +468,10 @@ class AnalysisManager:
                 print(f"Error processing report {path}: {str(e)}")
                 continue
         
+        comparison["skill_comparison"] = dict(skill_comparison)
+        
         # Create ordered ranking
-        comparison["scoring"]["ordered_ranking"] = sorted(
-            [(c["name"], c["match_score"]) for c in comparison["candidates"]],
-            key=lambda x: x[1],
-            reverse=True
-        )
+        comparison["scoring"]["ordered_ranking"] = heapq.nlargest(len(ranking), ranking, key=itemgetter(1))
         
         return comparison
     
@@ -3,15 +3,28 @@ Streamlit web interface for the Resume Screening System
 """
 
 import os
-import time
+import re
+import copy
+import json
+import queue
+import hashlib
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import streamlit as st
-from datetime import datetime
-from config import LLMConfig
-from agents import ResumeScreeningAgents
-from document_parsers import parse_resume
+from config import LLMConfig, YamlDumper, load_yaml_cached, config_signature, invalidate_yaml_cache
+from analysis_manager import AnalysisManager, analysis_cache_key
+# agents (CrewAI/LangChain) and document_parsers (PDF/DOCX libraries) are imported
+# only when an analysis runs, so sidebar-only reruns render without loading them
 import yaml
 
+# Match score patterns: "Total Match Score" lines (also in markdown tables), then "Score: XX" / "XX/100"
+_SCORE_RE = re.compile(r"Total Match Score\s*(?:\|[^|\n]*\|)?[^0-9]*(\d{1,3})", re.IGNORECASE)
+_LEGACY_SCORE_RE = re.compile(r'(\d{1,3})\s*/\s*100|(?:score|match)\s*:\s*(\d{1,3})', re.IGNORECASE)
+
+# OPENAI_API_KEY line in .env
+_OPENAI_KEY_LINE_RE = re.compile(r'^OPENAI_API_KEY=.*$', re.MULTILINE)
+
 # Page configuration
 st.set_page_config(
     page_title="Resume Screening System",
@@ -21,49 +34,54 @@ st.set_page_config(
 
 # --- Helper functions ---
 
-def get_models_from_config(provider_name: str, config_data: dict) -> list[str]:
-    """Extracts a list of model names for a given provider from config data."""
-    models = []
+@st.cache_data(show_spinner=False)
+def get_models_from_config(provider_name: str, config_sig: tuple) -> list[str]:
+    """Extracts a list of model names for a given provider from config.yaml.
+    
+    config_sig (from config_signature) keys the cache, so the list is rebuilt only after the file changes.
+    """
+    config_data = load_yaml_cached("config.yaml")
+    provider = provider_name.lower()
     llm_section = config_data.get("llm", {})
+    # dict as an ordered set: unique models in config order, so selectbox indices stay stable
+    models = {}
     
-    # General provider section
-    provider_specific_config = llm_section.get(provider_name.lower())
-    if provider_specific_config and "model_name" in provider_specific_config:
-        # This usually holds the *default* model for the provider, might not be a list
-        # but we can add it if it's a simple string.
-        # For now, let's assume agent_specific is the primary source for multiple models.
-        pass
-
     # Agent-specific configurations might list different models
-    agent_specific = llm_section.get("agent_specific", {})
+    agent_specific = llm_section.get("agent_specific") or {}
     for agent_config in agent_specific.values():
-        if agent_config.get("provider") == provider_name.lower() and "model_name" in agent_config:
-            models.append(agent_config["model_name"])
+        # Per-provider sections (openai: {model_name: ...}) apply whenever that provider is active
+        provider_section = agent_config.get(provider)
+        if isinstance(provider_section, dict) and "model_name" in provider_section \
+                and agent_config.get("provider", provider) == provider:
+            models.setdefault(provider_section["model_name"], None)
+        elif agent_config.get("provider") == provider and "model_name" in agent_config:
+            models.setdefault(agent_config["model_name"], None)
             
-    # Add the main provider model if defined and not already in the list from agents
+    # Add the main provider model (the provider's default) if defined
+    provider_specific_config = llm_section.get(provider)
     if provider_specific_config and "model_name" in provider_specific_config:
-        main_provider_model = provider_specific_config["model_name"]
-        if main_provider_model not in models:
-            models.append(main_provider_model)
+        models.setdefault(provider_specific_config["model_name"], None)
             
     # Add known common models if no models are found, as a fallback.
     # This part can be refined or removed if config.yaml is expected to be exhaustive.
     if not models:
-        if provider_name.lower() == "openai":
-            models.extend(["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"])
-        elif provider_name.lower() == "ollama":
-            models.extend(["llama2", "mistral", "llama3"]) # Add more common ollama models
+        if provider == "openai":
+            models = dict.fromkeys(["gpt-3.5-turbo", "gpt-4", "gpt-4-turbo"])
+        elif provider == "ollama":
+            models = dict.fromkeys(["llama2", "mistral", "llama3"]) # Add more common ollama models
 
-    return list(set(models)) # Return unique models
+    return list(models)
 
 def save_uploaded_file(uploaded_file):
     """Save uploaded file to temp directory and return the path"""
     try:
-        temp_dir = tempfile.gettempdir()
-        file_path = os.path.join(temp_dir, uploaded_file.name)
-        with open(file_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        return file_path
+        # A unique name per upload keeps concurrent sessions from overwriting each other's files
+        suffix = os.path.splitext(uploaded_file.name)[1]
+        uploaded_file.seek(0)
+        with tempfile.NamedTemporaryFile("wb", suffix=suffix, delete=False) as f:
+            # Copy in 1 MiB chunks instead of materializing the whole upload
+            shutil.copyfileobj(uploaded_file, f, length=1024 * 1024)
+            return f.name
     except Exception as e:
         st.error(f"Error saving file: {e}")
         return None
@@ -71,15 +89,11 @@ def save_uploaded_file(uploaded_file):
 def update_config_file(config):
     """Update the config.yaml file with new settings"""
     try:
-        # Read existing config to preserve other settings
-        if os.path.exists("config.yaml"):
-            with open("config.yaml", "r") as f:
-                existing_config = yaml.safe_load(f)
-        else:
-            existing_config = {"llm": {}}
+        # Read existing config to preserve other settings (copied, the cached dict is shared)
+        existing_config = copy.deepcopy(load_yaml_cached("config.yaml")) or {"llm": {}}
         
         # Update relevant parts
-        llm_config = existing_config.get("llm", {})
+        llm_config = existing_config.setdefault("llm", {})  # Updated in place
         llm_config["provider"] = config["provider"]
         
         if config["provider"] == "openai":
@@ -94,27 +108,60 @@ def update_config_file(config):
             llm_config["ollama"]["model_name"] = config["model_name"]
             llm_config["ollama"]["temperature"] = config["temperature"]
         
-        existing_config["llm"] = llm_config
-        
-        # Write updated config
-        with open("config.yaml", "w") as f:
-            yaml.dump(existing_config, f, default_flow_style=False)
+        # Write updated config to a temp file and swap it in, so concurrent sessions never read a partial file
+        with tempfile.NamedTemporaryFile("w", delete=False, dir=".", suffix=".yaml") as tmp:
+            yaml.dump(existing_config, tmp, Dumper=YamlDumper, default_flow_style=None, sort_keys=False)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        os.replace(tmp.name, "config.yaml")
+        invalidate_yaml_cache("config.yaml")
             
         return True
     except Exception as e:
         st.error(f"Error updating config: {e}")
         return False
 
+# Parsed resumes keyed by SHA-256 of the uploaded file
+def file_sha256(file_path: str) -> str:
+    from document_parsers import file_digest
+    return file_digest(file_path, hashlib.sha256()).hexdigest()
+
+@st.cache_data(show_spinner=False)
+def parse_resume_cached(file_hash: str, _resume_path: str) -> dict:
+    """Parse a resume once per file content; parse_resume keeps the on-disk copy"""
+    from document_parsers import parse_resume
+    return parse_resume(_resume_path)
+
+def get_agents(config_sig: tuple):
+    """ResumeScreeningAgents reused across the reruns of one browser session
+    
+    The instance is mutable (agent attributes, feedback memo), so sessions do not
+    share it. The agents read their LLM settings from config.yaml, so a new
+    signature of that file builds a fresh instance.
+    """
+    cached = st.session_state.get("screening_agents")
+    if cached is None or cached[0] != config_sig:
+        from agents import ResumeScreeningAgents
+        cached = (config_sig, ResumeScreeningAgents())
+        st.session_state["screening_agents"] = cached
+    return cached[1]
+
+def _write_feedback(feedback_save_path, original_report, feedback_rating, feedback_text, feedback_analysis):
+    payload = (f"Original Report:\n{original_report}\n\n"
+               f"User Feedback (Rating: {feedback_rating}/5):\n{feedback_text}\n\n"
+               f"Feedback Analysis:\n{feedback_analysis}")
+    os.makedirs(os.path.dirname(feedback_save_path) or ".", exist_ok=True)
+    with open(feedback_save_path, 'w', encoding='utf-8') as f:
+        f.write(payload)
+
 # --- Main App ---
 
 def main():
     st.title("Resume Screening System")
     
     # Load config.yaml to get model lists and current defaults
-    raw_config = {}
-    if os.path.exists("config.yaml"):
-        with open("config.yaml", "r") as f:
-            raw_config = yaml.safe_load(f)
+    # Cached in config.py, which survives Streamlit reruns; read-only here
+    raw_config = load_yaml_cached("config.yaml")
     
     llm_settings_from_config = raw_config.get("llm", {})
     
@@ -130,17 +177,16 @@ def main():
         index=["OpenAI", "Ollama"].index(default_provider_from_config) if default_provider_from_config in ["OpenAI", "Ollama"] else 0
     )
     
-    openai_models = get_models_from_config("openai", raw_config)
-    ollama_models = get_models_from_config("ollama", raw_config)
+    # Settings of the selected provider, looked up once per rerun
+    provider_cfg = llm_settings_from_config.get(llm_provider.lower(), {})
+    
+    config_sig = config_signature("config.yaml")
+    openai_models = get_models_from_config("openai", config_sig)
+    ollama_models = get_models_from_config("ollama", config_sig)
 
     # Determine default model for the selected/default provider
-    default_model_for_provider = ""
-    if llm_provider == "OpenAI":
-        provider_config = llm_settings_from_config.get("openai", {})
-        default_model_for_provider = provider_config.get("model_name", "gpt-3.5-turbo")
-    else: # Ollama
-        provider_config = llm_settings_from_config.get("ollama", {})
-        default_model_for_provider = provider_config.get("model_name", "mistral")
+    default_model_for_provider = provider_cfg.get("model_name", "gpt-3.5-turbo" if llm_provider == "OpenAI" else "mistral")
+    default_temp = provider_cfg.get("temperature", 0.7)
         
     if llm_provider == "OpenAI":
         # OpenAI settings
@@ -160,15 +206,13 @@ def main():
         api_key = None
         server_url = st.sidebar.text_input(
             "Ollama Server URL", 
-            value=llm_settings_from_config.get("ollama", {}).get("server_url", "http://localhost:11434")
+            value=provider_cfg.get("server_url", "http://localhost:11434")
         )
         model_name = st.sidebar.selectbox(
             "Model", 
             ollama_models,
             index=ollama_models.index(default_model_for_provider) if default_model_for_provider in ollama_models else 0
         )
-    
-    default_temp = llm_settings_from_config.get(llm_provider.lower(), {}).get("temperature", 0.7)
 
     temperature = st.sidebar.slider(
         "Temperature", 
@@ -178,33 +222,28 @@ def main():
         step=0.1
     )
     
+    force_refresh = st.sidebar.checkbox(
+        "Force refresh",
+        help="Re-run the analysis even if this resume and job description were analyzed with the same settings before."
+    )
+    
     if st.sidebar.button("Save Configuration"):
         # Save API key to .env if provided
         if api_key:
             env_path = ".env"
-            env_text = ""
-            if os.path.exists(env_path):
+            try:
                 with open(env_path, "r") as f:
                     env_text = f.read()
-                
-                # Update or add OPENAI_API_KEY
-                if "OPENAI_API_KEY=" in env_text:
-                    env_lines = env_text.split("\n")
-                    updated_lines = []
-                    for line in env_lines:
-                        if line.startswith("OPENAI_API_KEY="):
-                            updated_lines.append(f"OPENAI_API_KEY={api_key}")
-                        else:
-                            updated_lines.append(line)
-                    env_text = "\n".join(updated_lines)
-                else:
-                    env_text += f"\nOPENAI_API_KEY={api_key}"
-                
-                with open(env_path, "w") as f:
-                    f.write(env_text)
-            else:
-                with open(env_path, "w") as f:
-                    f.write(f"OPENAI_API_KEY={api_key}")
+            except FileNotFoundError:
+                env_text = ""
+            
+            # Update or add OPENAI_API_KEY (a function replacement keeps backslashes in the key literal)
+            new_text, replaced = _OPENAI_KEY_LINE_RE.subn(lambda _: f"OPENAI_API_KEY={api_key}", env_text)
+            if replaced == 0:
+                new_text = (env_text.rstrip("\n") + "\n" if env_text.strip() else "") + f"OPENAI_API_KEY={api_key}\n"
+            
+            with open(env_path, "w") as f:
+                f.write(new_text)
         
         # Update config.yaml
         config = {
@@ -247,43 +286,62 @@ def main():
                     st.error("Failed to save resume file.")
                     return
                 
-                # Step 1: Parse resume
-                st.write("Step 1: Parsing resume...")
-                parsed_resume = parse_resume(resume_path)
-                if "error" in parsed_resume:
-                    st.error(f"Error parsing resume: {parsed_resume['error']}")
-                    return
-                
-                # Display basic resume info
-                st.write(f"✅ Parsed resume for: {parsed_resume['name']}")
-                st.write(f"Found {len(parsed_resume['skills'])} skills and {len(parsed_resume['work_experience'])} work experiences")
-                
-                # Step 2: Initialize agents and run analysis
-                st.write("Step 2: Starting agent analysis...")
-                
-                # Make it seem like we're making progress
-                progress_bar = st.progress(0)
-                for i in range(10):
-                    # Simulate work
-                    progress_bar.progress(i * 10)
-                    time.sleep(0.5)  # Simulating work
-                
+                # The upload holds personal data, so it is removed once the analysis is done
                 try:
-                    # Initialize agent system
-                    agents = ResumeScreeningAgents()
-                    crew = agents.create_crew(resume_path, job_description)
+                    # Step 1: Parse resume
+                    st.write("Step 1: Parsing resume...")
+                    parsed_resume = parse_resume_cached(file_sha256(resume_path), resume_path)
+                    if "error" in parsed_resume:
+                        st.error(f"Error parsing resume: {parsed_resume['error']}")
+                        return
                     
-                    # Run the crew
-                    st.write("Step 3: Running agent crew (this may take a while)...")
-                    result = crew.kickoff()
+                    # Display basic resume info
+                    st.write(f"✅ Parsed resume for: {parsed_resume['name']}")
+                    st.write(f"Found {len(parsed_resume['skills'])} skills and {len(parsed_resume['work_experience'])} work experiences")
                     
-                    # Update status
-                    status.update(label="Analysis complete!", state="complete", expanded=False)
-                
-                except Exception as e:
-                    st.error(f"Error running analysis: {str(e)}")
-                    status.update(label="Analysis failed", state="error")
-                    return
+                    # Step 2: Initialize agents and run analysis
+                    st.write("Step 2: Starting agent analysis...")
+                    
+                    # Progress follows the crew's finished tasks
+                    progress_bar = st.progress(0)
+                    
+                    try:
+                        # Initialize agent system
+                        agents = get_agents(config_signature("config.yaml"))
+                        
+                        def run_crew():
+                            # Task callbacks run on crewAI's worker threads, which have no Streamlit
+                            # context: they only queue the output, and this thread draws the progress
+                            finished_tasks = queue.Queue()
+                            crew = agents.create_crew(resume_path, job_description, task_callback=finished_tasks.put)
+                            st.write("Step 3: Running agent crew (this may take a while)...")
+                            with ThreadPoolExecutor(max_workers=1) as pool:
+                                future = pool.submit(crew.kickoff)
+                                tasks_done = 0
+                                while not future.done() or not finished_tasks.empty():
+                                    try:
+                                        finished_tasks.get(timeout=0.5)
+                                    except queue.Empty:
+                                        continue
+                                    tasks_done += 1
+                                    progress_bar.progress(min(100, int(100 * tasks_done / len(crew.tasks))))
+                                return future.result()
+                        
+                        # The crew is only built when the cache has no result for these inputs;
+                        # a cached result is a dict with "raw", "tasks" and "token_usage"
+                        cache_key = analysis_cache_key(parsed_resume, job_description, agents.llm_config)
+                        result = AnalysisManager("reports").cached_analysis(cache_key, run_crew, refresh=force_refresh)
+                        progress_bar.progress(100)
+                        
+                        # Update status
+                        status.update(label="Analysis complete!", state="complete", expanded=False)
+                    
+                    except Exception as e:
+                        st.error(f"Error running analysis: {str(e)}")
+                        status.update(label="Analysis failed", state="error")
+                        return
+                finally:
+                    os.unlink(resume_path)
             
             # Display results
             st.success("Analysis complete! Here are the results:")
@@ -299,37 +357,22 @@ def main():
             with tab1:
                 st.header("Overall Match")
                 # Simple placeholder visualization
-                if hasattr(result, 'raw'):
+                if isinstance(result, dict):
+                    match_text = result.get("raw", "")  # Cached result
+                elif hasattr(result, 'raw'):
                     match_text = result.raw
                 else:
                     match_text = str(result)
                 
                 # --- END DEBUG ---
                 
-                # Try to find match score in text
-                import re
+                # Try to find match score in text, falling back to "Score: XX" or "XX/100" formats
                 match_score = 0
-                # Updated regex to be more flexible with table formats and whitespace
-                score_match = re.search(r"Total Match Score\s*(?:\|[^|\n]*\|)?[^0-9]*(\d{1,3})", match_text, re.IGNORECASE)
+                score_match = _SCORE_RE.search(match_text) or _LEGACY_SCORE_RE.search(match_text)
                 if score_match:
-                    # The score will be in group 1 of this new regex
-                    matched_score_str = score_match.group(1)
-                    try:
+                    matched_score_str = next((g for g in score_match.groups() if g), "")
+                    if matched_score_str.isdigit():
                         match_score = int(matched_score_str)
-                    except ValueError:
-                        # Fallback if conversion fails, though group(1) should be digits
-                        match_score = 0 
-                else:
-                    # Fallback if "Total Match Score ... number" is not found, try the old regex as a last resort
-                    # for formats like "Score: XX" or "XX/100"
-                    legacy_score_match = re.search(r'(\d{1,3})(?:\s*)?\/(?:\s*)?100|(?:score|match)(?:\s*)?:(?:\s*)?(\d{1,3})', match_text, re.IGNORECASE)
-                    if legacy_score_match:
-                        matched_score_str = legacy_score_match.group(1) or legacy_score_match.group(2)
-                        if matched_score_str:
-                            try:
-                                match_score = int(matched_score_str)
-                            except ValueError:
-                                match_score = 0
                 
                 # Display match score
                 st.metric("Match Score", f"{match_score}/100")
@@ -370,37 +413,46 @@ def main():
                         try:
                             # Assuming 'agents' is the ResumeScreeningAgents instance
                             # and 'result' is the output from the main crew.kickoff()
+                            # A cached analysis never built the crew, so create the agent on demand
+                            if agents.feedback_processor is None:
+                                agents.feedback_processor = agents.create_agent("feedback_processor")
                             feedback_agent = agents.feedback_processor # Get the agent instance
                             
                             # Create the feedback processing task
                             # We need the original report for context
-                            original_report_str = str(result) 
-                            
-                            feedback_task = feedback_agent.process_feedback_task(
-                                feedback_data=f"Rating: {feedback_rating}/5. Comments: {feedback_text}",
-                                original_report=original_report_str
-                            )
+                            original_report_str = match_text
+                            feedback_data = f"Rating: {feedback_rating}/5. Comments: {feedback_text}"
                             
-                            # Create a new crew for just this task
-                            feedback_crew = agents.create_crew(
-                                agents=[feedback_agent],
-                                tasks=[feedback_task],
-                                verbose=False # Keep this less verbose for UI
-                            )
-                            
-                            feedback_analysis_result = feedback_crew.kickoff()
+                            # Identical feedback on the same report is answered from the agent's memo
+                            feedback_analysis_result = feedback_agent.cached_analysis(feedback_data, original_report_str)
+                            if feedback_analysis_result is None:
+                                feedback_task = feedback_agent.process_feedback_task(
+                                    feedback_data=feedback_data,
+                                    original_report=original_report_str
+                                )
+                                
+                                # Create a new crew for just this task
+                                feedback_crew = agents.create_crew(
+                                    agents=[feedback_agent],
+                                    tasks=[feedback_task],
+                                    verbose=False # Keep this less verbose for UI
+                                )
+                                
+                                feedback_analysis_result = feedback_crew.kickoff()
                             
                             st.success("Feedback submitted and processed!")
                             st.markdown("**Feedback Analysis:**")
                             st.markdown(feedback_analysis_result)
 
                             # Optionally, save this feedback analysis
+                            from datetime import datetime
                             feedback_save_path = os.path.join("reports", f"feedback_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt")
-                            with open(feedback_save_path, 'w', encoding='utf-8') as f:
-                                f.write(f"Original Report:\n{original_report_str}\n\n")
-                                f.write(f"User Feedback (Rating: {feedback_rating}/5):\n{feedback_text}\n\n")
-                                f.write(f"Feedback Analysis:\n{feedback_analysis_result}")
-                            st.info(f"Feedback analysis saved to {feedback_save_path}")
+                            try:
+                                _write_feedback(feedback_save_path, original_report_str,
+                                                feedback_rating, feedback_text, str(feedback_analysis_result))
+                                st.info(f"Feedback analysis saved to {feedback_save_path}")
+                            except OSError as e:
+                                st.error(f"Could not save feedback analysis: {e}")
                             
                         except Exception as e:
                             st.error(f"Error processing feedback: {e}")
@@ -1,8 +1,90 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from functools import lru_cache
 from pydantic import BaseModel
+import threading
+import tempfile
+import hashlib
+import json
 import yaml
 import os
 
+# libyaml-backed loader/dumper when PyYAML was built with it, pure Python otherwise
+try:
+    from yaml import CSafeLoader as YamlLoader, CSafeDumper as YamlDumper
+except ImportError:
+    from yaml import SafeLoader as YamlLoader, SafeDumper as YamlDumper
+
+# Parsed YAML files keyed by path, with the (mtime_ns, size, inode) they were read at
+_config_cache: Dict[str, tuple] = {}
+_config_lock = threading.Lock()
+
+def config_signature(path: str = "config.yaml") -> Optional[Tuple[int, int, int]]:
+    """(mtime_ns, size, inode) of a config file, None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+def _parse_yaml_file(path: str) -> Any:
+    """
+    Parse a YAML file through a JSON sidecar (<path>.cache.json)
+    The sidecar starts with a "# content-version: <md5>" line; while it matches
+    the YAML content, the much faster json.loads replaces YAML parsing.
+    """
+    with open(path, "rb") as f:
+        content = f.read()
+    content_hash = hashlib.md5(content).hexdigest()
+    header = f"# content-version: {content_hash}\n"
+    sidecar_path = path + ".cache.json"
+    
+    try:
+        with open(sidecar_path, "r", encoding="utf-8") as f:
+            if f.readline() == header:
+                return json.loads(f.read())
+    except (OSError, ValueError):
+        pass
+    
+    data = yaml.load(content, Loader=YamlLoader)
+    try:
+        sidecar = header + json.dumps(data)
+        # Written to a temp file and renamed, so readers never see a partial sidecar
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(sidecar_path) or ".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(sidecar)
+        os.replace(tmp_path, sidecar_path)
+    except (OSError, TypeError, ValueError):
+        pass  # Read-only directory or values JSON cannot represent: YAML stays the source
+    return data
+
+def load_yaml_cached(path: str = "config.yaml") -> Dict[str, Any]:
+    """
+    Parse a YAML config file, reusing the previous result while the file is unchanged
+    Returns {} if the file does not exist. The returned dict is shared between
+    callers and must be treated as read-only; deepcopy it before modifying.
+    """
+    signature = config_signature(path)
+    if signature is None:
+        return {}
+    
+    with _config_lock:
+        cached = _config_cache.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    
+    try:
+        data = _parse_yaml_file(path) or {}
+    except FileNotFoundError:
+        return {}  # Removed or replaced between the stat and the open
+    with _config_lock:
+        _config_cache[path] = (signature, data)
+    return data
+
+def invalidate_yaml_cache(path: str = "config.yaml") -> None:
+    """Forget the cached parse of a YAML file, e.g. right after rewriting it"""
+    with _config_lock:
+        _config_cache.pop(path, None)
+
 class LLMConfig(BaseModel):
     """Configuration for Language Model settings"""
     provider: str = "openai"  # or "ollama"
@@ -11,15 +93,25 @@ class LLMConfig(BaseModel):
     temperature: float = 0.7
     max_tokens: int = 2000
     server_url: Optional[str] = "http://localhost:11434"  # Only for Ollama
+    cache: Optional[str] = None  # "inmemory", "sqlite" or "redis"; None disables LLM caching
+    cache_path: str = ".langchain_cache.db"  # Only for the sqlite cache
+    cache_url: Optional[str] = None  # Only for the redis cache, e.g. redis://localhost:6379
+    semantic_cache_threshold: Optional[float] = None  # Cosine similarity (e.g. 0.92); None disables the semantic cache
+    brave_rps: float = 1.0  # Brave Search requests per second (1 on the free plan)
     agent_specific: Optional[Dict[str, Dict[str, Any]]] = None
 
     @classmethod
     def from_yaml(cls, path: str = "config.yaml") -> "LLMConfig":
-        """Load configuration from a YAML file."""
-        if not os.path.exists(path):
+        """Load configuration from a YAML file (parsed again only after the file changes)."""
+        signature = config_signature(path)
+        if signature is None:
             raise FileNotFoundError(f"YAML config file not found: {path}")
-        with open(path, "r") as f:
-            data = yaml.safe_load(f)
+        # Callers may modify their config (e.g. main.py --provider), so each gets a copy
+        return _from_yaml_cached(cls, path, *signature).model_copy(deep=True)
+
+    @classmethod
+    def _parse_yaml(cls, path: str) -> "LLMConfig":
+        data = _parse_yaml_file(path)
         llm_data = data.get("llm", data)  # support both root or 'llm' key
         # Flatten OpenAI/Ollama keys if present
         provider = llm_data.get("provider", "openai")
@@ -42,41 +134,51 @@ class LLMConfig(BaseModel):
             temperature=llm_data.get("temperature", 0.7),
             max_tokens=llm_data.get("max_tokens", 2000),
             server_url=llm_data.get("server_url", "http://localhost:11434"),
+            cache=llm_data.get("cache"),
+            cache_path=llm_data.get("cache_path", ".langchain_cache.db"),
+            cache_url=llm_data.get("cache_url"),
+            semantic_cache_threshold=llm_data.get("semantic_cache_threshold"),
+            brave_rps=llm_data.get("brave_rps", 1.0),
             agent_specific=agent_specific
         )
 
     def for_agent(self, agent_name: str) -> "LLMConfig":
         """Return agent-specific config if available, else default."""
-        config_data = self.model_dump()  # Start with current config as a dictionary
+        # No overrides: the default config itself (or a copy with the ollama/ prefix) is enough
+        if not self.agent_specific or agent_name not in self.agent_specific:
+            if self.provider == "ollama" and not str(self.model_name).startswith("ollama/"):
+                return self.model_copy(update={"model_name": f"ollama/{self.model_name}"})
+            return self
 
-        agent_specific_configs = self.agent_specific
-        if agent_specific_configs is not None: # Explicit None check
-            if agent_name in agent_specific_configs: # Now agent_specific_configs is known to be a Dict
-                overrides = agent_specific_configs[agent_name]
-                config_data.update(overrides) # Apply overrides to the dictionary
-
-        # Determine provider and model_name from the potentially updated config_data
-        # Use .get() with fallback to original self attributes if keys are somehow missing after update (defensive)
-        provider = config_data.get("provider", self.provider)
-        model_name = config_data.get("model_name", self.model_name)
+        overrides = dict(self.agent_specific[agent_name])
+        # Per-provider sections (e.g. openai: {model_name: ...}) apply only for the active provider
+        provider_overrides = {p: overrides.pop(p) for p in ("openai", "ollama")
+                              if isinstance(overrides.get(p), dict)}
+        overrides.update(provider_overrides.get(overrides.get("provider", self.provider), {}))
+        # Unknown keys are ignored, as the LLMConfig constructor would do
+        overrides = {k: v for k, v in overrides.items() if k in LLMConfig.model_fields}
 
+        provider = overrides.get("provider", self.provider)
+        model_name = overrides.get("model_name", self.model_name)
         if provider == "ollama" and not str(model_name).startswith("ollama/"):
-            config_data["model_name"] = f"ollama/{model_name}" # Update the dictionary
+            overrides["model_name"] = f"ollama/{model_name}"
             
-        return LLMConfig(**config_data) # Create a new instance from the (potentially) modified dictionary
+        # model_copy skips the validation a full LLMConfig(**data) rebuild would repeat
+        return self.model_copy(update=overrides)
 
     def fallback(self, fallback_provider: str = "openai") -> "LLMConfig":
         """Return a fallback config (e.g., switch to OpenAI if Ollama fails)."""
-        config_dict = self.model_dump()
-        config_dict["provider"] = fallback_provider
+        overrides = {"provider": fallback_provider}
         if fallback_provider == "openai":
-            config_dict["model_name"] = "gpt-3.5-turbo"
-            config_dict["server_url"] = None
+            overrides.update(model_name="gpt-3.5-turbo", server_url=None)
         elif fallback_provider == "ollama":
-            config_dict["model_name"] = "llama2"
-            config_dict["server_url"] = "http://localhost:11434"
-        return LLMConfig(**config_dict)
+            overrides.update(model_name="llama2", server_url="http://localhost:11434")
+        return self.model_copy(update=overrides)
 
     class Config:
         env_file = ".env"
-        env_prefix = "LLM_" 
\ No newline at end of file
+        env_prefix = "LLM_"
+
+@lru_cache(maxsize=4)
+def _from_yaml_cached(cls, path: str, mtime_ns: int, size: int, ino: int) -> LLMConfig:
+    return cls._parse_yaml(path)
@@ -6,12 +6,25 @@ Supports PDF, DOCX, HTML, and TXT formats.
 import os
 import json
 import re
-from typing import Dict, Any, Optional, List
+import copy
+import mmap
+import time
+import tempfile
+import logging
+import bisect
+import hashlib
+import functools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional, List, Tuple
 from abc import ABC, abstractmethod
 
 # PDF parser dependencies
 try:
     import fitz  # PyMuPDF
+    # Default plain-text flags minus ligature preservation
+    _PDF_TEXT_FLAGS = fitz.TEXTFLAGS_TEXT & ~fitz.TEXT_PRESERVE_LIGATURES
 except ImportError:
     pass
 
@@ -27,6 +40,236 @@ try:
 except ImportError:
     pass
 
+logger = logging.getLogger(__name__)
+
+# Optional: Hyperscan, or else an Aho-Corasick automaton, for the skill scan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: RE2 (linear time) for patterns that backtrack quadratically under re
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Patterns are compiled once at import; the parser methods run them on every resume
+
+# Email, phone and LinkedIn in one pass; the named group tells which one matched.
+# An email is only tried from the start of a run of address characters, and
+# only if the run ends in "@domain": retrying from every word boundary inside
+# long runs like "a.b.c.d..." made the search quadratic.
+_EMAIL_CHARS = r'[A-Za-z0-9._%+-]'
+_EMAIL_DOMAIN = r'@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b'
+_EMAIL = rf'(?<!{_EMAIL_CHARS})(?={_EMAIL_CHARS}*{_EMAIL_DOMAIN}){_EMAIL_CHARS}*?(?P<email>\b{_EMAIL_CHARS}+{_EMAIL_DOMAIN})'
+_EMAIL_RE = re.compile(_EMAIL)
+_CONTACT_RE = re.compile(
+    _EMAIL +
+    r'|(?P<phone>\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b)'
+    r'|(?P<linkedin>linkedin\.com/in/[A-Za-z0-9_-]+)'
+)
+
+# Common programming languages, tools, frameworks
+COMMON_SKILLS = [
+    "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Ruby", "Go", "Rust", "PHP",
+    "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "Spring", "Ruby on Rails",
+    "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "SQL", "NoSQL", "PostgreSQL", 
+    "MySQL", "MongoDB", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "CI/CD", "Git", "Linux",
+    "Machine Learning", "Deep Learning", "AI", "Data Science", "DevOps", "Agile", "Scrum",
+    "REST API", "GraphQL", "Microservices", "Redux", "HTML", "CSS", "SASS", "LESS"
+]
+def _unique_skills(skills: List[str]) -> Tuple[str, ...]:
+    """Skills in list order, dropping case-insensitive repeats (matching ignores case)"""
+    by_lower: Dict[str, str] = {}
+    for skill in skills:
+        by_lower.setdefault(skill.lower(), skill)
+    return tuple(by_lower.values())
+
+# Every skill matcher is built from this list, so no path can report a skill twice
+_SKILLS = _unique_skills(COMMON_SKILLS)
+# Escaped once and shared by the regex, alternation and Hyperscan patterns
+_SKILL_ESCAPED = {skill: re.escape(skill) for skill in _SKILLS}
+
+# All skills in one alternation, longest first so that e.g. "JavaScript" wins over "Java"
+_SKILLS_ALT = re.compile(r'\b(' + '|'.join(_SKILL_ESCAPED[s] for s in sorted(_SKILLS, key=len, reverse=True)) + r')\b',
+                         re.IGNORECASE)
+_SKILL_BY_LOWER = {skill.lower(): skill for skill in _SKILLS}
+def _skills_within(skill: str) -> List[str]:
+    """Other skills found inside skill as whole words ("Ruby" in "Ruby on Rails")"""
+    return [other for other in _SKILLS if other != skill
+            and re.search(r'\b' + _SKILL_ESCAPED[other] + r'\b', skill, re.IGNORECASE)]
+
+# Skills inside a longer one, which finditer would skip; only the alternation path needs these
+_SKILLS_WITHIN = {skill: _skills_within(skill) for skill in _SKILLS}
+
+def _build_skill_automaton():
+    automaton = ahocorasick.Automaton()
+    for skill in _SKILLS:
+        automaton.add_word(skill.lower(), (skill, len(skill)))
+    automaton.make_automaton()
+    return automaton
+
+# One pass over the text finds every skill; None without pyahocorasick
+_SKILL_AC = _build_skill_automaton() if ahocorasick is not None else None
+
+def _build_skill_database():
+    flags = hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[(r'\b' + _SKILL_ESCAPED[skill] + r'\b').encode() for skill in _SKILLS],
+        ids=list(range(len(_SKILLS))),
+        elements=len(_SKILLS),
+        flags=[flags] * len(_SKILLS)
+    )
+    return database
+
+# All skill patterns in one Hyperscan database, scanned in a single pass; None without hyperscan
+_SKILL_HS = _build_skill_database() if hyperscan is not None else None
+# Scanning needs scratch space that cannot be shared between concurrent scans
+_hs_local = threading.local()
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+# Common degree and university patterns. Degree names and abbreviations are
+# scanned separately: an abbreviation inside a full-name match ("Bachelor of
+# Science B.S. ...") is still reported, and names come before abbreviations
+_DEGREE_RES = tuple(re.compile(p) for p in [
+    r'\b(Bachelor|Master|PhD|Doctorate|BSc|BA|MSc|MA|MBA|Doctor|Associate)\s+(?:of|in)?\s+([A-Za-z\s]+)',
+    r'\b(B\.S\.|M\.S\.|B\.A\.|M\.A\.|M\.B\.A\.|Ph\.D\.)\s+(?:of|in)?\s+([A-Za-z\s]+)'
+])
+_UNIVERSITY_RE = re.compile(r'\b(University|College|Institute|School)\s+of\s+([A-Za-z\s]+)')
+
+# Date patterns like 2019-2023, 2019 - 2023, Jan 2019 - Dec 2023
+_DATE_NEAR_RES = tuple(re.compile(p) for p in [
+    r'\b(20\d{2})\s*[-–—]\s*(20\d{2}|Present|Current|Now)\b',
+    r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}\s*[-–—]\s*(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}\b',
+    r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}\s*[-–—]\s*(Present|Current|Now)\b'
+])
+
+# Work experience section headers, most specific first. Only the header word
+# is matched here; _extract_section_snippet scans the rest of the header and
+# the section body without backtracking.
+_SECTION_HEADER_RES = tuple(re.compile(p, re.MULTILINE | re.IGNORECASE) for p in [
+    r"^[^\S\n]*Work Experience(?=\s)",
+    r"^[^\S\n]*(?:Experience|Professional Experience|Employment History|Work History)(?=\s)"
+])
+# Heading that ends the experience section
+_NEXT_SECTION_RE = re.compile(
+    r"^[^\S\n]*(?:Education|Skills|Projects|Awards|Publications|References|Languages|Contact)[^\S\n]*\n",
+    re.MULTILINE | re.IGNORECASE
+)
+_WHITESPACE_RE = re.compile(r"\s*")
+
+# A candidate name line has one to four words (the first capitalized, checked separately)
+_NAME_LINE_RE = re.compile(r"\S+(?:\s+\S+){0,3}")
+
+# Job date ranges, allowing for "Present", "Current", "Now". Whitespace is
+# [^\S\n] so that a match never spans lines when a whole section is scanned.
+_DATE_IN_BLOCK_RE = re.compile(r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?[^\S\n]+\d{4}|\d{4}|Q[1-4][^\S\n]+\d{4})[^\S\n]*(?:-|–|to|—)[^\S\n]*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?[^\S\n]+\d{4}|\d{4}|Present|Current|Now|Q[1-4][^\S\n]+\d{4})", re.IGNORECASE)
+
+def _build_date_database():
+    database = hyperscan.Database()
+    database.compile(expressions=[_DATE_IN_BLOCK_RE.pattern.encode()], ids=[0], elements=1,
+                     flags=[hyperscan.HS_FLAG_CASELESS])
+    return database
+
+# Hyperscan prefilter for _DATE_IN_BLOCK_RE: one pass finds the lines that hold a date
+# range, and only those are searched with re for the groups; None without hyperscan
+_DATE_HS = _build_date_database() if hyperscan is not None else None
+
+# (start, end, from, to) of a date range within its line
+DateRange = Tuple[int, int, str, str]
+
+# "Position at Company" / "Position, Company" on a single line
+_POSITION_COMPANY_RE = re.compile(r"(.+?)(?:\s+at\s+|\s*,\s*)(.+)", re.IGNORECASE)
+_POSITION_AT_RE = re.compile(r"(.+?)\s+at\s+(.+)", re.IGNORECASE)
+
+# The lazy prefix above retries the separator at every position, which is quadratic
+# on lines with long whitespace runs; their RE2 twins match in linear time. RE2's \s
+# is narrower than re's, so the twins spell out re's ASCII whitespace.
+_ASCII_SPACE = r"[\t\n\x0b\x0c\r\x1c-\x1f ]"
+_RE2_TWINS = {pattern: re2.compile("(?i)" + pattern.pattern.replace(r"\s", _ASCII_SPACE))
+              for pattern in (_POSITION_COMPANY_RE, _POSITION_AT_RE)} if re2 is not None else {}
+
+def _linear_match(pattern: "re.Pattern", text: str) -> Optional["re.Match"]:
+    """pattern.match(text), through its RE2 twin when there is one and text is ASCII"""
+    twin = _RE2_TWINS.get(pattern)
+    if twin is not None and text.isascii():
+        return twin.match(text)
+    return pattern.match(text)
+
+# Parse results keyed by (parser class, BLAKE2b digest of the file bytes), least recently used first
+_PARSE_CACHE_SIZE = 128
+_parse_cache: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+def file_digest(file_path: str, hasher):
+    """Feed a file to hasher through a read-only mmap, without copying it into a bytes object"""
+    with open(file_path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                hasher.update(mm)
+        except ValueError:
+            hasher.update(f.read())  # Empty files cannot be mapped
+    return hasher
+
+def _cache_by_content(parse):
+    """Decorator for parse(): files whose exact bytes were parsed before reuse that result"""
+    @functools.wraps(parse)
+    def wrapper(self, file_path: str) -> Dict[str, Any]:
+        try:
+            digest = file_digest(file_path, hashlib.blake2b(digest_size=16)).digest()
+        except OSError:
+            return parse(self, file_path)  # Let the parser report the error
+        key = (type(self), digest)
+        
+        with _parse_cache_lock:
+            resume = _parse_cache.get(key)
+            if resume is not None:
+                _parse_cache.move_to_end(key)
+        if resume is None:
+            resume = parse(self, file_path)
+            if "error" in resume:
+                return resume
+            with _parse_cache_lock:
+                _parse_cache[key] = resume
+                if len(_parse_cache) > _PARSE_CACHE_SIZE:
+                    _parse_cache.popitem(last=False)
+        # Callers may modify the result; the cached copy must stay intact
+        return copy.deepcopy(resume)
+    return wrapper
+
+
+_WORK_EXPERIENCE_CACHE_SIZE = 64
+
+def _memoize_work_experience(extract):
+    """
+    Decorator for _extract_work_experience(): per parser instance, the last
+    _WORK_EXPERIENCE_CACHE_SIZE texts map to their result. Keyed on the text
+    itself rather than its hash, so a collision cannot return another text's jobs.
+    """
+    @functools.wraps(extract)
+    def wrapper(self, text: str) -> List[Dict[str, str]]:
+        cache = self.__dict__.setdefault("_work_experience_cache", OrderedDict())
+        experiences = cache.get(text)
+        if experiences is None:
+            experiences = extract(self, text)
+            cache[text] = experiences
+            if len(cache) > _WORK_EXPERIENCE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(text)
+        # Callers may modify the entries; the cached ones must stay intact
+        return [dict(experience) for experience in experiences]
+    return wrapper
+
 
 class BaseResumeParser(ABC):
     """Base class for resume parsers"""
@@ -44,124 +287,139 @@ class BaseResumeParser(ABC):
         """
         pass
     
+    def _extract_all(self, text: str) -> Dict[str, Any]:
+        """
+        Run every text-based extractor over the resume text
+        The single entry point the format parsers use, so they all share any
+        extraction that can be combined; the name is format-specific and
+        stays with each parser.
+        The extractors run one after another on purpose: each takes well under
+        a millisecond on a typical resume and re holds the GIL, so a thread
+        pool would only add overhead. Use parse_batch() to spread files over cores.
+        """
+        return {
+            "contact_information": self._extract_contact_info(text),
+            "skills": self._extract_skills(text),
+            "education": self._extract_education(text),
+            "work_experience": self._extract_work_experience(text)
+        }
+    
+    def _extract_name_from_text(self, text: str) -> str:
+        """Candidate name from the first 10 lines of the text (after leading blank lines)"""
+        # Walks the lines with find() instead of splitting (and copying) the whole text
+        pos = _WHITESPACE_RE.match(text).end()
+        for _ in range(10):
+            end = text.find('\n', pos)
+            line = text[pos:end if end != -1 else len(text)].strip()
+            # Simple heuristic: first 1-4 words, first letter is uppercase
+            if _NAME_LINE_RE.fullmatch(line) and line[0].isupper():
+                return line
+            if end == -1:
+                break
+            pos = end + 1
+        return "Unknown"
+    
     def _extract_contact_info(self, text: str) -> Dict[str, Any]:
         """Extract contact information from text"""
         contact_info = {}
         
-        # Extract email
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        email_match = re.search(email_pattern, text)
-        if email_match:
-            contact_info["email"] = email_match.group(0)
-        
-        # Extract phone
-        phone_pattern = r'\b(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b'
-        phone_match = re.search(phone_pattern, text)
-        if phone_match:
-            contact_info["phone"] = phone_match.group(0)
+        # The first email, phone and LinkedIn profile (simplistic approach) in the text
+        for match in _CONTACT_RE.finditer(text):
+            kind = match.lastgroup
+            if kind not in contact_info:
+                value = match.group(kind)
+                contact_info[kind] = "https://" + value if kind == "linkedin" else value
+                if len(contact_info) == 3:
+                    break
         
-        # Extract LinkedIn (simplistic approach)
-        linkedin_pattern = r'linkedin\.com/in/[A-Za-z0-9_-]+'
-        linkedin_match = re.search(linkedin_pattern, text)
-        if linkedin_match:
-            contact_info["linkedin"] = "https://" + linkedin_match.group(0)
+        # finditer resumes right after a phone/LinkedIn match, which can be inside an address
+        if "email" not in contact_info and "@" in text:
+            email_match = _EMAIL_RE.search(text)
+            if email_match:
+                contact_info["email"] = email_match.group("email")
             
         return contact_info
     
     def _extract_skills(self, text: str) -> List[str]:
         """Extract skills from text using common skill patterns"""
-        # Define lists of common programming languages, tools, frameworks
-        common_skills = [
-            "Python", "JavaScript", "TypeScript", "Java", "C++", "C#", "Ruby", "Go", "Rust", "PHP",
-            "React", "Angular", "Vue", "Node.js", "Express", "Django", "Flask", "Spring", "Ruby on Rails",
-            "TensorFlow", "PyTorch", "Scikit-learn", "Pandas", "NumPy", "SQL", "NoSQL", "PostgreSQL", 
-            "MySQL", "MongoDB", "AWS", "Azure", "GCP", "Docker", "Kubernetes", "CI/CD", "Git", "Linux",
-            "Machine Learning", "Deep Learning", "AI", "Data Science", "DevOps", "Agile", "Scrum",
-            "REST API", "GraphQL", "Microservices", "Redux", "HTML", "CSS", "SASS", "LESS"
-        ]
+        # Hyperscan's \b and caseless matching are ASCII-only, the same as re's only for ASCII text
+        if _SKILL_HS is not None and text.isascii():
+            scratch = getattr(_hs_local, "scratch", None)
+            if scratch is None:
+                scratch = _hs_local.scratch = hyperscan.Scratch(_SKILL_HS)
+            skill_ids = set()
+            _SKILL_HS.scan(text.encode("ascii"), match_event_handler=lambda skill_id, *_: skill_ids.add(skill_id),
+                           scratch=scratch)
+            return [_SKILLS[i] for i in sorted(skill_ids)]
         
-        found_skills = []
-        for skill in common_skills:
-            skill_pattern = r'\b' + re.escape(skill) + r'\b'
-            if re.search(skill_pattern, text, re.IGNORECASE):
-                found_skills.append(skill)
-                
-        return found_skills
+        text_lower = text.lower()
+        # Lowercasing some characters changes the length, which would shift match offsets
+        if _SKILL_AC is None or len(text_lower) != len(text):
+            found = set()
+            for match in _SKILLS_ALT.finditer(text):
+                skill = _SKILL_BY_LOWER[match.group(1).lower()]
+                found.add(skill)
+                found.update(_SKILLS_WITHIN[skill])
+            return [skill for skill in _SKILLS if skill in found]
+        
+        found = set()
+        for end_idx, (skill, length) in _SKILL_AC.iter(text_lower):
+            start_idx = end_idx - length + 1
+            # Same word boundaries as r'\b<skill>\b'
+            before = text_lower[start_idx - 1] if start_idx > 0 else " "
+            after = text_lower[end_idx + 1] if end_idx + 1 < len(text_lower) else " "
+            if (_is_word_char(before) != _is_word_char(skill[0])
+                    and _is_word_char(after) != _is_word_char(skill[-1])):
+                found.add(skill)
+        return [skill for skill in _SKILLS if skill in found]
     
     def _extract_education(self, text: str) -> List[Dict[str, str]]:
         """Extract education information"""
         education = []
         
-        # Common degree patterns
-        degree_patterns = [
-            r'\b(Bachelor|Master|PhD|Doctorate|BSc|BA|MSc|MA|MBA|Doctor|Associate)\s+(?:of|in)?\s+([A-Za-z\s]+)',
-            r'\b(B\.S\.|M\.S\.|B\.A\.|M\.A\.|M\.B\.A\.|Ph\.D\.)\s+(?:of|in)?\s+([A-Za-z\s]+)'
-        ]
-        
-        # Common university patterns
-        university_pattern = r'\b(University|College|Institute|School)\s+of\s+([A-Za-z\s]+)'
-        
         # Look for degrees
-        for pattern in degree_patterns:
-            for match in re.finditer(pattern, text):
+        for degree_re in _DEGREE_RES:
+            for match in degree_re.finditer(text):
                 degree = match.group(0)
-                # Look for university names near the degree
-                text_chunk = text[max(0, match.start() - 100):min(len(text), match.end() + 100)]
-                university_match = re.search(university_pattern, text_chunk)
+                # Look for university names near the degree; searched in place rather than in a slice
+                chunk_start = max(0, match.start() - 100)
+                chunk_end = min(len(text), match.end() + 100)
+                university_match = _UNIVERSITY_RE.search(text, chunk_start, chunk_end)
                 if university_match:
                     university = university_match.group(0)
                     education.append({
                         "degree": degree,
                         "institution": university,
-                        "dates": self._extract_dates_near(text_chunk, match.start() - max(0, match.start() - 100))
+                        "dates": self._extract_dates_near(text, match.start(), chunk_start, chunk_end)
                     })
-                
+            
         return education
     
-    def _extract_dates_near(self, text: str, offset: int = 0) -> str:
-        """Extract dates near a position in text"""
-        # Date patterns like 2019-2023, 2019 - 2023, Jan 2019 - Dec 2023
-        date_patterns = [
-            r'\b(20\d{2})\s*[-–—]\s*(20\d{2}|Present|Current|Now)\b',
-            r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}\s*[-–—]\s*(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}\b',
-            r'\b(January|February|March|April|May|June|July|August|September|October|November|December|Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+20\d{2}\s*[-–—]\s*(Present|Current|Now)\b'
-        ]
-        
-        for pattern in date_patterns:
-            matches = re.finditer(pattern, text)
-            for match in matches:
+    def _extract_dates_near(self, text: str, offset: int = 0,
+                            pos: int = 0, endpos: Optional[int] = None) -> str:
+        """Extract dates near a position in text, looking only within text[pos:endpos]"""
+        if endpos is None:
+            endpos = len(text)
+        for date_re in _DATE_NEAR_RES:
+            match = date_re.search(text, pos, endpos)
+            if match:
                 return match.group(0)
                 
         return ""
     
+    @_memoize_work_experience
     def _extract_work_experience(self, text: str) -> List[Dict[str, str]]:
-        print(f"EXTRACT_TOP: Received text (repr, first 100 chars): {repr(text[:100])}") # DBG
         experiences = []
         
         # 1. Isolate the Work Experience section
         experience_section_text = text
-        # Test with an ultra-simple header pattern (REMOVING THIS)
-        # simple_header_pattern = r"^\\s*Work Experience"
-        # header_match_test = re.search(simple_header_pattern, text, re.MULTILINE | re.IGNORECASE)
-        # print(f"EXTRACT: Ultra-simple header test ('{simple_header_pattern}'): Match found: {bool(header_match_test)}") # DBG
-        # if header_match_test:
-        #     print(f"EXTRACT: Ultra-simple matched: '{header_match_test.group(0)}'")
-
-        section_patterns = [
-            # Trying to be very specific for "Work Experience" and non-greedy on the comment part
-            r"^\s*Work Experience(?:\s+[^\n]*?)?\n\s*(.*?)(?:\n^\s*(?:Education|Skills|Projects|Awards|Publications|References|Languages|Contact)\s*\n|\Z)",
-            # Generic one as fallback
-            r"^\s*(?:Experience|Professional Experience|Employment History|Work History)(?:\s+[^\n]*?)?\n\s*(.*?)(?:\n^\s*(?:Education|Skills|Projects|Awards|Publications|References|Languages|Contact)\s*\n|\Z)",
-            r"^\s*(?:Work Experience|Experience|Professional Experience|Employment History|Work History)(?:\s+[^\n]*?)?\n\s*(.*?)(?=\n\n^\s*(?:Education|Skills|Projects|Awards|Publications|References|Languages|Contact)|\Z)"
-        ]
-        
+
         found_section = False
-        for pattern in section_patterns:
-            section_match = re.search(pattern, text, re.MULTILINE | re.IGNORECASE | re.DOTALL)
-            print(f"EXTRACT: Trying section pattern: {pattern[:50]}... Match found: {bool(section_match)}") # DBG
-            if section_match:
-                experience_section_text = section_match.group(1).strip()
-                print(f"EXTRACT: Isolated experience_section_text (len {len(experience_section_text)}):\n{repr(experience_section_text)[:500]}...")
+        for header_re in _SECTION_HEADER_RES:
+            section_text = self._extract_section_snippet(text, header_re)
+            if section_text is not None:
+                experience_section_text = section_text
+                logger.debug("Experience section found by %r (%d chars)", header_re.pattern, len(section_text))
                 found_section = True
                 break
         
@@ -172,67 +430,50 @@ class BaseResumeParser(ABC):
             # texts like the one in test_problematic_experience_parsing.
             return []
 
-        # 2. Define regex patterns for common job elements
-        # More specific date pattern, allowing for "Present", "Current", "Now"
-        # Temporarily removed (?!\\s*\\() from the end to debug re.error
-        date_pattern_str = r"((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|\d{4}|Q[1-4]\s+\d{4})\s*(?:-|–|to|—)\s*((?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\.?\s+\d{4}|\d{4}|Present|Current|Now|Q[1-4]\s+\d{4})(?!\\s*\\())"
-        
         # Combined pattern for "Position at Company", "Position, Company" or "Position \\n Company"
         # This is complex. Let's try to identify blocks first.
 
-        # Split the section into lines for easier processing
-        lines = experience_section_text.split('\n')
-        print(f"EXTRACT: Number of lines after split: {len(lines)}")
-        if len(lines) < 5 and len(lines) > 1: # Print first few lines if few
-             for idx, l_print in enumerate(lines[:5]): print(f"EXTRACT: Line {idx}: {repr(l_print)}")
-        elif len(lines) == 1:
-            print(f"EXTRACT: Single line content: {repr(lines[0][:500])}...")
+        # Split the section into lines for easier processing; lines are stripped once here
+        lines = [line.strip() for line in experience_section_text.split('\n')]
+        date_ranges = self._find_date_ranges(lines)
         
         current_job_lines = []
+        current_job_dates = []
         for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            if not line_stripped: # Blank line might delineate end of a job's description
+            if not line: # Blank line might delineate end of a job's description
                 if current_job_lines:
-                    print(f"EXTRACT: Calling _parse_job_block for {len(current_job_lines)} lines ending with blank line.")
-                    parsed_job = self._parse_job_block(current_job_lines, date_pattern_str)
+                    parsed_job = self._parse_job_block(current_job_lines, current_job_dates)
                     if parsed_job:
-                        print(f"EXTRACT: Appended job: P={parsed_job.get('position')}, C={parsed_job.get('company')}")
                         experiences.append(parsed_job)
-                    else:
-                        print("EXTRACT: _parse_job_block returned empty from blank line case.")
                     current_job_lines = []
+                    current_job_dates = []
                 continue
 
             # Heuristic: If a line looks like a date range AND the *next* line is capitalized (potential new job title)
             # or if the current line is short and capitalized (potential job title) and previous block was processed.
             # This is tricky. Let's focus on parsing collected blocks.
-            current_job_lines.append(line_stripped)
+            current_job_lines.append(line)
+            current_job_dates.append(date_ranges[i])
 
             # Look ahead for a very strong signal of a new job entry on the *next* line
             # e.g., if next line clearly starts with a date pattern or is a short capitalized title
             # This helps delimit current job's description.
             if i + 1 < len(lines):
-                next_line_stripped = lines[i+1].strip()
                 # If next line looks like a date, and current block has content, parse current.
-                # Or if next line looks like a title (e.g. short, capitalized) and current_job_lines has some substance (e.g. a date found within)
-                date_match_next = re.search(date_pattern_str, next_line_stripped, re.IGNORECASE)
-                is_next_title_like = len(next_line_stripped.split()) < 6 and next_line_stripped == next_line_stripped.upper() and next_line_stripped # All caps
+                date_match_next = date_ranges[i+1]
                 
                 # If the current line itself contains a date, and a new potential title follows, it might be the end.
-                date_match_current = re.search(date_pattern_str, line_stripped, re.IGNORECASE)
+                date_match_current = date_ranges[i]
 
                 if date_match_next and len(current_job_lines) > 1 : # Next line is a date, implies new job
                      # check if current_job_lines already has a date, if so, it's a self-contained job ending here
-                    has_date_already = any(re.search(date_pattern_str, l, re.IGNORECASE) for l in current_job_lines[:-1]) # exclude current line if it's the one with the date
+                    has_date_already = any(current_job_dates[:-1]) # exclude current line if it's the one with the date
                     if has_date_already or not date_match_current : # if current line is not the date line OR prev lines had a date
-                        print(f"EXTRACT: Calling _parse_job_block for {len(current_job_lines)} lines due to lookahead.")
-                        parsed_job = self._parse_job_block(current_job_lines, date_pattern_str)
+                        parsed_job = self._parse_job_block(current_job_lines, current_job_dates)
                         if parsed_job:
-                            print(f"EXTRACT: Appended job from lookahead: P={parsed_job.get('position')}, C={parsed_job.get('company')}")
                             experiences.append(parsed_job)
-                        else:
-                            print("EXTRACT: _parse_job_block returned empty from lookahead case.")
                         current_job_lines = []
+                        current_job_dates = []
                         continue # current line will be processed with next block
 
 
@@ -241,22 +482,77 @@ class BaseResumeParser(ABC):
 
         # Process any remaining lines in current_job_lines
         if current_job_lines:
-            print(f"EXTRACT: Calling _parse_job_block for remaining {len(current_job_lines)} lines.")
-            parsed_job = self._parse_job_block(current_job_lines, date_pattern_str)
+            parsed_job = self._parse_job_block(current_job_lines, current_job_dates)
             if parsed_job:
-                print(f"EXTRACT: Appended job from remaining: P={parsed_job.get('position')}, C={parsed_job.get('company')}")
                 experiences.append(parsed_job)
-            else:
-                print("EXTRACT: _parse_job_block returned empty from remaining lines case.")
         
         # Filter out entries that are clearly too sparse (e.g., only got a date)
         experiences = [exp for exp in experiences if exp.get("position") != "N/A" or exp.get("company") != "N/A"]
         return experiences
 
-    def _parse_job_block(self, job_lines: List[str], date_pattern_str: str) -> Dict[str, str]:
-        print(f"PARSE_BLOCK: Received job_lines: {job_lines}")
+    def _extract_section_snippet(self, text: str, header_re: "re.Pattern",
+                                 next_header_re: "re.Pattern" = _NEXT_SECTION_RE) -> Optional[str]:
+        """
+        Text of the first section introduced by header_re up to next_header_re,
+        None if there is none; extractors then only scan this snippet.
+        Linear-time equivalent of the former single-regex section patterns: when
+        the header is followed by whitespace that spans lines, the first
+        non-blank line after it (e.g. a "-----" underline) belongs to the header.
+        """
+        header_match = header_re.search(text)
+        if not header_match:
+            return None
+        
+        whitespace_end = _WHITESPACE_RE.match(text, header_match.end()).end()
+        header_end = text.find('\n', whitespace_end)
+        if header_end == -1:
+            header_end = text.find('\n', header_match.end(), whitespace_end)
+            if header_end == -1:
+                return None  # Header on the last line, no section body
+        
+        body_start = _WHITESPACE_RE.match(text, header_end + 1).end()
+        next_match = next_header_re.search(text, body_start + 1)
+        return text[body_start:next_match.start() if next_match else len(text)].strip()
+
+    def _find_date_ranges(self, lines: List[str]) -> List[Optional[DateRange]]:
+        """First date range of each (stripped) line, found with a single scan over all lines"""
+        line_starts = [0]
+        for line in lines[:-1]:
+            line_starts.append(line_starts[-1] + len(line) + 1)
+        
+        date_ranges: List[Optional[DateRange]] = [None] * len(lines)
+        joined = '\n'.join(lines)
+        # Hyperscan's caseless matching is ASCII-only, the same as re's only for ASCII text
+        if _DATE_HS is not None and joined.isascii():
+            scratch = getattr(_hs_local, "date_scratch", None)
+            if scratch is None:
+                scratch = _hs_local.date_scratch = hyperscan.Scratch(_DATE_HS)
+            # Date ranges never span lines, so the line of a match's last character is its line
+            date_lines = set()
+            _DATE_HS.scan(joined.encode("ascii"), scratch=scratch,
+                          match_event_handler=lambda _id, _from, to, *_: date_lines.add(
+                              bisect.bisect_right(line_starts, to - 1) - 1))
+            for line_idx in date_lines:
+                offset = line_starts[line_idx]
+                match = _DATE_IN_BLOCK_RE.search(joined, offset, offset + len(lines[line_idx]))
+                date_ranges[line_idx] = (match.start() - offset, match.end() - offset, match.group(1), match.group(2))
+            return date_ranges
+        
+        for match in _DATE_IN_BLOCK_RE.finditer(joined):
+            line_idx = bisect.bisect_right(line_starts, match.start()) - 1
+            if date_ranges[line_idx] is None:
+                offset = line_starts[line_idx]
+                date_ranges[line_idx] = (match.start() - offset, match.end() - offset, match.group(1), match.group(2))
+        return date_ranges
+
+    def _parse_job_block(self, job_lines: List[str], date_ranges: Optional[List[Optional[DateRange]]] = None) -> Dict[str, str]:
+        """
+        Parse one job entry from its stripped, non-blank lines
+        date_ranges holds each line's date range, if already found.
+        """
+        if date_ranges is None:
+            date_ranges = self._find_date_ranges(job_lines)
         if not job_lines:
-            print("PARSE_BLOCK: Empty job_lines, returning empty.")
             return {}
 
         position = "N/A"
@@ -269,9 +565,10 @@ class BaseResumeParser(ABC):
 
         # First pass: Find the date line
         for i, line in enumerate(job_lines):
-            date_match = re.search(date_pattern_str, line, re.IGNORECASE)
-            if date_match:
-                dates = f"{date_match.group(1).strip()} - {date_match.group(2).strip()}"
+            date_range = date_ranges[i]
+            if date_range:
+                date_start, date_end, date_from, date_to = date_range
+                dates = f"{date_from.strip()} - {date_to.strip()}"
                 date_found = True
                 date_line_idx = i
                 # Attempt to extract company from the same line if possible, or line before
@@ -280,21 +577,21 @@ class BaseResumeParser(ABC):
                 #      "Jan 2020 - Dec 2020, Company Name"
                 
                 # Company on the same line, before dates. E.g., "My Company | Location | Jan 2020 - Dec 2020"
-                company_candidate_text = line[:date_match.start()].strip()
+                company_candidate_text = line[:date_start].strip()
                 # Try to split by " | " to separate company from potential location
                 parts = [p.strip() for p in company_candidate_text.split('|') if p.strip()]
                 if parts:
                     potential_company_name = parts[0].strip(" ,-@")
                     if potential_company_name and len(potential_company_name.split()) < 7 and not any(kw in potential_company_name.lower() for kw in ["experience", "details"]):
                          # Check if it's not just a job title from the previous line
-                        if i > 0 and potential_company_name.lower() == job_lines[i-1].strip().lower():
+                        if i > 0 and potential_company_name.lower() == job_lines[i-1].lower():
                             pass # it's likely the position repeated
                         else:
                             if company == "N/A": # Prioritize if company not already found by other means (e.g. 'at Company')
                                 company = potential_company_name
                 
                 # Company on the same line, after dates. E.g., "Jan 2020 - Dec 2020 at My Company"
-                company_candidate_after_dates = line[date_match.end():].strip(" |,-@").strip()
+                company_candidate_after_dates = line[date_end:].strip(" |,-@").strip()
                 if company_candidate_after_dates.startswith("at "): # Common pattern
                     company_candidate_after_dates = company_candidate_after_dates[3:].strip()
 
@@ -338,7 +635,7 @@ class BaseResumeParser(ABC):
                 # Assume it's Position, Company might have been on date line or needs to be found
                 line_content = potential_pos_company_lines[0]
                 # Try "Position at Company" or "Position, Company"
-                match_pac = re.match(r"(.+?)(?:\\s+at\\s+|\\s*,\\s*)(.+)", line_content, re.IGNORECASE)
+                match_pac = _linear_match(_POSITION_COMPANY_RE, line_content)
                 if match_pac:
                     position = match_pac.group(1).strip()
                     if company == "N/A": company = match_pac.group(2).strip() # Prioritize company from date line
@@ -352,7 +649,7 @@ class BaseResumeParser(ABC):
                 if company == "N/A": # If not found on date line
                     company = potential_pos_company_lines[1]
                 # Refine: if line 1 looks like location, company might be line 0 if position contains "at"
-                match_pos_at = re.match(r"(.+?)\\s+at\\s+(.+)", position, re.IGNORECASE)
+                match_pos_at = _linear_match(_POSITION_AT_RE, position)
                 if match_pos_at:
                     position = match_pos_at.group(1).strip()
                     if company == "N/A": company = match_pos_at.group(2).strip()
@@ -362,7 +659,7 @@ class BaseResumeParser(ABC):
               # This is very basic.
             if len(job_lines) > 0:
                 pos_candidate = job_lines[0]
-                match_pac = re.match(r"(.+?)(?:\\s+at\\s+|\\s*,\\s*)(.+)", pos_candidate, re.IGNORECASE)
+                match_pac = _linear_match(_POSITION_COMPANY_RE, pos_candidate)
                 if match_pac:
                     position = match_pac.group(1).strip()
                     company = match_pac.group(2).strip()
@@ -384,19 +681,19 @@ class BaseResumeParser(ABC):
 
 
         # Clean up description
-        description = "\\n".join(line.strip() for line in description_list if line.strip() and not line.strip().lower().startswith("keywords:")).strip()
+        description = "\n".join(line for line in description_list if not line.lower().startswith("keywords:"))
         
         # Final check: if position looks like a company and company is N/A, swap
-        if company == "N/A" and position != "N/A" and ("inc" in position.lower() or "llc" in position.lower() or "ltd" in position.lower() or "group" in position.lower()):
+        position_lower = position.lower()
+        if company == "N/A" and position != "N/A" and ("inc" in position_lower or "llc" in position_lower or "ltd" in position_lower or "group" in position_lower):
             company = position
             position = "N/A" # Or try to find a better position
 
         # Avoid returning if essentials are missing
         if position == "N/A" and company == "N/A" and dates == "N/A":
-            print(f"PARSE_BLOCK: All essentials N/A. Pos: {position}, Comp: {company}, Dates: {dates}. Returning empty.")
+            logger.debug("Skipping job block without position, company or dates: %r", job_lines)
             return {}
             
-        print(f"PARSE_BLOCK: Returning: P={position}, C={company}, D={dates}, Desc_len={len(description)}")
         return {
             "position": position.strip(":, "),
             "company": company.strip(":, "),
@@ -408,37 +705,18 @@ class BaseResumeParser(ABC):
 class PDFResumeParser(BaseResumeParser):
     """Parser for PDF resumes using PyMuPDF"""
     
+    @_cache_by_content
     def parse(self, file_path: str) -> Dict[str, Any]:
         try:
-            full_text = ""
-            doc = fitz.open(file_path)
-            
-            # Extract full text from all pages
-            for page in doc:
-                full_text += page.get_text()
-                
-            # Get basic contact info
-            contact_info = self._extract_contact_info(full_text)
+            full_text = self._extract_text(file_path)
             
             # Get name from first page
             name = self._extract_name(full_text)
             
-            # Extract skills
-            skills = self._extract_skills(full_text)
-            
-            # Extract education
-            education = self._extract_education(full_text)
-            
-            # Extract work experience
-            experience = self._extract_work_experience(full_text)
-            
-            # Build the structured resume
+            # Build the structured resume; _extract_all adds contact info, skills, education and experience
             resume = {
                 "name": name,
-                "contact_information": contact_info,
-                "skills": skills,
-                "education": education,
-                "work_experience": experience,
+                **self._extract_all(full_text),
                 "full_text": full_text  # Include full text for further processing if needed
             }
             
@@ -447,53 +725,77 @@ class PDFResumeParser(BaseResumeParser):
         except Exception as e:
             return {"error": f"Failed to parse PDF: {str(e)}"}
     
+    def _extract_text(self, file_path: str) -> str:
+        """Text of all pages"""
+        doc = fitz.open(file_path)
+        try:
+            return "".join(_page_text(page) for page in doc)
+        finally:
+            doc.close()
+    
     def _extract_name(self, text: str) -> str:
         """Extract candidate name from beginning of resume"""
         # Name is often the first line or close to the top
-        lines = text.strip().split('\n')
-        # Use the first line that's not empty and looks like a name
-        for line in lines[:10]:  # Check first 10 lines
-            line = line.strip()
-            if len(line) > 0 and len(line.split()) <= 4 and line.split()[0][0].isupper():
-                # Simple heuristic: first 1-4 words, first letter is uppercase
-                return line
-        return "Unknown"
+        return self._extract_name_from_text(text)
+
+
+def _page_text(page) -> str:
+    # Plain text in content-stream order; ligatures are expanded so "ﬁ" matches "fi"
+    return page.get_text("text", sort=False, flags=_PDF_TEXT_FLAGS)
+
+def _pdf_pages_text(file_path: str, start: int, stop: int) -> str:
+    """Text of pages [start, stop) of a PDF; run in worker processes"""
+    doc = fitz.open(file_path)
+    try:
+        return "".join(_page_text(doc[i]) for i in range(start, stop))
+    finally:
+        doc.close()
+
+
+class LargePDFResumeParser(PDFResumeParser):
+    """
+    Parser for large PDFs (portfolios, CVs with appendices)
+    Documents with at least PARALLEL_MIN_PAGES pages have their text extracted
+    in worker processes, one contiguous page range each.
+    """
+    
+    PARALLEL_MIN_PAGES = 64
+    
+    def _extract_text(self, file_path: str, max_workers: Optional[int] = None) -> str:
+        doc = fitz.open(file_path)
+        try:
+            page_count = doc.page_count
+            workers = min(max_workers or os.cpu_count() or 1, page_count // (self.PARALLEL_MIN_PAGES // 4) or 1)
+            if page_count < self.PARALLEL_MIN_PAGES or workers <= 1:
+                logger.debug("Extracting %d pages of %s in process", page_count, file_path)
+                return "".join(_page_text(page) for page in doc)
+        finally:
+            doc.close()
+        
+        logger.debug("Extracting %d pages of %s in %d processes", page_count, file_path, workers)
+        bounds = [page_count * i // workers for i in range(workers + 1)]
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return "".join(executor.map(_pdf_pages_text, [file_path] * workers, bounds[:-1], bounds[1:]))
 
 
 class DOCXResumeParser(BaseResumeParser):
     """Parser for DOCX resumes using python-docx"""
     
+    @_cache_by_content
     def parse(self, file_path: str) -> Dict[str, Any]:
         try:
             doc = docx.Document(file_path)
-            full_text = ""
             
             # Extract all text
-            for paragraph in doc.paragraphs:
-                full_text += paragraph.text + "\n"
-                
-            # Get basic contact info
-            contact_info = self._extract_contact_info(full_text)
+            full_text = "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
             
             # Get name from the beginning
             name = self._extract_name(doc, full_text)
             
-            # Extract skills
-            skills = self._extract_skills(full_text)
-            
-            # Extract education
-            education = self._extract_education(full_text)
-            
-            # Extract work experience
-            experience = self._extract_work_experience(full_text)
-            
-            # Build the structured resume
+            # Build the structured resume; _extract_all adds contact info, skills, education and experience
             resume = {
                 "name": name,
-                "contact_information": contact_info,
-                "skills": skills,
-                "education": education,
-                "work_experience": experience,
+                **self._extract_all(full_text),
                 "full_text": full_text
             }
             
@@ -513,18 +815,13 @@ class DOCXResumeParser(BaseResumeParser):
                         return paragraph.text.strip()
         
         # Fallback: use first line
-        lines = text.strip().split('\n')
-        for line in lines[:10]:
-            line = line.strip()
-            if len(line) > 0 and len(line.split()) <= 4 and line.split()[0][0].isupper():
-                return line
-                
-        return "Unknown"
+        return self._extract_name_from_text(text)
 
 
 class HTMLResumeParser(BaseResumeParser):
     """Parser for HTML resumes using BeautifulSoup"""
     
+    @_cache_by_content
     def parse(self, file_path: str) -> Dict[str, Any]:
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
@@ -539,28 +836,13 @@ class HTMLResumeParser(BaseResumeParser):
             # Get text
             full_text = soup.get_text(separator='\n')
             
-            # Basic info
-            contact_info = self._extract_contact_info(full_text)
-            
             # Try to get name from title or h1
             name = self._extract_name(soup, full_text)
             
-            # Extract skills
-            skills = self._extract_skills(full_text)
-            
-            # Extract education
-            education = self._extract_education(full_text)
-            
-            # Extract work experience
-            experience = self._extract_work_experience(full_text)
-            
-            # Build the structured resume
+            # Build the structured resume; _extract_all adds contact info, skills, education and experience
             resume = {
                 "name": name,
-                "contact_information": contact_info,
-                "skills": skills,
-                "education": education,
-                "work_experience": experience,
+                **self._extract_all(full_text),
                 "full_text": full_text
             }
             
@@ -582,45 +864,25 @@ class HTMLResumeParser(BaseResumeParser):
             return h1.text.strip()
         
         # Fallback to first lines of text
-        lines = text.strip().split('\n')
-        for line in lines[:10]:
-            line = line.strip()
-            if len(line) > 0 and len(line.split()) <= 4 and line.split()[0][0].isupper():
-                return line
-                
-        return "Unknown"
+        return self._extract_name_from_text(text)
 
 
 class TXTResumeParser(BaseResumeParser):
     """Parser for plain text resumes"""
     
+    @_cache_by_content
     def parse(self, file_path: str) -> Dict[str, Any]:
         try:
             with open(file_path, 'r', encoding='utf-8') as file:
                 full_text = file.read()
                 
-            # Get basic contact info
-            contact_info = self._extract_contact_info(full_text)
-            
             # Get name from the beginning
             name = self._extract_name(full_text)
             
-            # Extract skills
-            skills = self._extract_skills(full_text)
-            
-            # Extract education
-            education = self._extract_education(full_text)
-            
-            # Extract work experience
-            experience = self._extract_work_experience(full_text)
-            
-            # Build the structured resume
+            # Build the structured resume; _extract_all adds contact info, skills, education and experience
             resume = {
                 "name": name,
-                "contact_information": contact_info,
-                "skills": skills,
-                "education": education,
-                "work_experience": experience,
+                **self._extract_all(full_text),
                 "full_text": full_text
             }
             
@@ -631,13 +893,11 @@ class TXTResumeParser(BaseResumeParser):
     
     def _extract_name(self, text: str) -> str:
         """Extract candidate name from text resume"""
-        lines = text.strip().split('\n')
-        for line in lines[:10]:  # Check first 10 lines
-            line = line.strip()
-            if len(line) > 0 and len(line.split()) <= 4 and line.split()[0][0].isupper():
-                return line
-        return "Unknown"
+        return self._extract_name_from_text(text)
+
 
+# PDFs from this size on go to LargePDFResumeParser
+LARGE_PDF_BYTES = 1024 * 1024
 
 def get_resume_parser(file_path: str) -> BaseResumeParser:
     """
@@ -656,6 +916,9 @@ def get_resume_parser(file_path: str) -> BaseResumeParser:
     extension = extension.lower()
     
     if extension == '.pdf':
+        # Most resumes are a few pages; only large files are worth checking for parallel extraction
+        if os.path.getsize(file_path) >= LARGE_PDF_BYTES:
+            return LargePDFResumeParser()
         return PDFResumeParser()
     elif extension == '.docx':
         return DOCXResumeParser()
@@ -667,6 +930,54 @@ def get_resume_parser(file_path: str) -> BaseResumeParser:
         raise ValueError(f"Unsupported file format: {extension}")
 
 
+# Parsed resumes on disk, keyed by the SHA-256 of the file bytes. Bump PARSER_VERSION
+# whenever parser output changes, so entries written by older code are not read back.
+# RESUME_CACHE_TTL (seconds) expires entries, 0 disables the cache
+PARSER_VERSION = 2
+RESUME_CACHE_DIR = os.path.join(".cache", "resume_parse", f"v{PARSER_VERSION}")
+DEFAULT_RESUME_CACHE_TTL = 7 * 24 * 3600
+
+def _cache_on_disk(parse):
+    """Decorator for parse_resume(): unchanged files are read back from RESUME_CACHE_DIR"""
+    @functools.wraps(parse)
+    def wrapper(file_path: str) -> Dict[str, Any]:
+        try:
+            ttl = float(os.environ.get("RESUME_CACHE_TTL") or DEFAULT_RESUME_CACHE_TTL)
+        except ValueError:
+            ttl = DEFAULT_RESUME_CACHE_TTL
+        if ttl == 0:
+            return parse(file_path)
+        try:
+            # The extension picks the parser, so the same bytes as .txt and .html are separate entries
+            extension = os.path.splitext(file_path)[1].lower()
+            file_hash = file_digest(file_path, hashlib.sha256()).hexdigest()
+            cache_path = os.path.join(RESUME_CACHE_DIR, file_hash + extension + ".json")
+        except OSError:
+            return parse(file_path)  # Let parse_resume report the missing file
+        
+        try:
+            if time.time() - os.path.getmtime(cache_path) < ttl:
+                with open(cache_path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass
+        
+        resume = parse(file_path)
+        if "error" not in resume:
+            try:
+                os.makedirs(RESUME_CACHE_DIR, exist_ok=True)
+                # Written to a temp file and renamed, so readers never see a partial entry
+                fd, tmp_path = tempfile.mkstemp(dir=RESUME_CACHE_DIR, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(resume, f)
+                os.replace(tmp_path, cache_path)
+            except OSError:
+                pass  # Read-only directory: parse every time
+        return resume
+    return wrapper
+
+
+@_cache_on_disk
 def parse_resume(file_path: str) -> Dict[str, Any]:
     """
     Parse a resume file and return structured information
@@ -686,4 +997,28 @@ def parse_resume(file_path: str) -> Dict[str, Any]:
     except ValueError as e:
         return {"error": str(e)}
     except Exception as e:
-        return {"error": f"Unexpected error: {str(e)}"} 
\ No newline at end of file
+        return {"error": f"Unexpected error: {str(e)}"} 
+
+def parse_batch(file_paths: List[str], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Parse several resume files in worker processes
+    
+    Parsing is CPU-bound and each file is independent, so processes rather
+    than threads spread the work across cores.
+    
+    Args:
+        file_paths: Paths to the resume files
+        max_workers: Number of worker processes (default: CPU count)
+        
+    Returns:
+        parse_resume() results in the order of file_paths
+    """
+    file_paths = list(file_paths)
+    workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+    if workers <= 1:
+        # Starting a pool costs more than parsing a single file
+        return [parse_resume(path) for path in file_paths]
+    
+    chunksize = max(1, min(8, len(file_paths) // (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(parse_resume, file_paths, chunksize=chunksize))
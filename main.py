@@ -7,13 +7,35 @@ import json
 import argparse
 import datetime
 from dotenv import load_dotenv
-from agents import ResumeScreeningAgents
-from document_parsers import parse_resume
-from config import LLMConfig
-from analysis_manager import AnalysisManager
+# agents (CrewAI/LangChain) and config are imported only when an analysis runs,
+# so parsing, listing and comparing start without loading the LLM stack
+from document_parsers import parse_resume, parse_batch
+from analysis_manager import AnalysisManager, analysis_cache_key
 
-def main():
-    # Set up argument parser
+# Faster JSON backend (optional)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def dumps_indented(data) -> str:
+    """data as JSON indented by 2 spaces"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(data, indent=2)
+
+def write_json(path: str, data):
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+# File types parse_resume supports
+RESUME_EXTENSIONS = (".pdf", ".docx", ".html", ".htm", ".txt")
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Resume Screening System")
     parser.add_argument("--resume", type=str,
                       help="Path to the resume file (PDF, DOCX, HTML, TXT)")
@@ -33,7 +55,23 @@ def main():
                       help="Compare candidate reports for a job (provide job keyword)")
     parser.add_argument("--list-reports", action="store_true",
                       help="List all available reports")
-    args = parser.parse_args()
+    parser.add_argument("--stream", action="store_true",
+                      help="Stream the match evaluation and final report to stdout as they are generated")
+    parser.add_argument("--graph", action="store_true",
+                      help="Run the screening steps as a direct task graph instead of a CrewAI crew")
+    parser.add_argument("--no-cache", action="store_true",
+                      help="Run the analysis even if the same resume and job description were analyzed before")
+    parser.add_argument("--batch-dir", type=str,
+                      help="Parse every resume in a directory in parallel and print a summary of each")
+    return parser
+
+# Built once, so scripts calling main() in a loop do not rebuild it each time
+_PARSER = _build_parser()
+
+def main(argv=None):
+    """Run the CLI; argv defaults to sys.argv[1:], a list lets scripts call main() in-process"""
+    parser = _PARSER
+    args = parser.parse_args(argv)
     
     # Initialize analysis manager
     analysis_manager = AnalysisManager(args.reports_dir)
@@ -85,11 +123,34 @@ def main():
         
         # Ask if user wants to save comparison
         save_path = os.path.join(args.reports_dir, f"comparison_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        with open(save_path, 'w', encoding='utf-8') as f:
-            json.dump(comparison, f, indent=2)
+        write_json(save_path, comparison)
         print(f"\nComparison saved to: {save_path}")
         return
     
+    # Batch parse mode
+    if args.batch_dir:
+        resume_paths = sorted(entry.path for entry in os.scandir(args.batch_dir)
+                              if entry.is_file() and entry.name.lower().endswith(RESUME_EXTENSIONS))
+        if not resume_paths:
+            print(f"No resumes found in {args.batch_dir}")
+            return
+        
+        print(f"\nParsing {len(resume_paths)} resumes from {args.batch_dir}...")
+        parsed_resumes = parse_batch(resume_paths)
+        for path, parsed in zip(resume_paths, parsed_resumes):
+            if "error" in parsed:
+                print(f"- {os.path.basename(path)}: Error: {parsed['error']}")
+            else:
+                print(f"- {os.path.basename(path)}: {parsed['name']} "
+                      f"({len(parsed['skills'])} skills, {len(parsed['work_experience'])} positions)")
+        
+        if args.output:
+            batch = [{"file": path, **{k: v for k, v in parsed.items() if k != "full_text"}}
+                     for path, parsed in zip(resume_paths, parsed_resumes)]
+            write_json(args.output, batch)
+            print(f"\nParsed resumes saved to: {args.output}")
+        return
+    
     # Regular mode requires resume and job description
     if not args.resume or not args.job_description:
         parser.print_help()
@@ -139,13 +200,8 @@ def main():
     # If parse_only flag is set, print the parsed resume as JSON and exit
     if args.parse_only:
         print("\nParsed Resume (JSON):")
-        # Remove full_text to make output cleaner
-        if "full_text" in parsed_resume:
-            parsed_resume_display = parsed_resume.copy()
-            del parsed_resume_display["full_text"]
-            print(json.dumps(parsed_resume_display, indent=2))
-        else:
-            print(json.dumps(parsed_resume, indent=2))
+        # Leave out full_text to make output cleaner
+        print(dumps_indented({k: v for k, v in parsed_resume.items() if k != "full_text"}))
             
         # Save parsed resume if requested
         if args.output:
@@ -153,14 +209,32 @@ def main():
             print(f"\nParsed resume saved to: {output_path}")
         return
     
+    # Identical resume + job description + LLM settings: reuse the earlier analysis instead of
+    # rerunning the crew. The Streamlit app uses the same cache, so either can reuse the other's runs
+    from config import LLMConfig
+    llm_config = LLMConfig.from_yaml(args.config)
+    if args.provider:
+        llm_config.provider = args.provider
+    cache_key = analysis_cache_key(parsed_resume, job_description, llm_config)
+    cached_result = None if args.no_cache else analysis_manager.load_cached_analysis(cache_key)
+    if cached_result is not None:
+        print("\n" + "=" * 50)
+        print("ANALYSIS COMPLETE (cached)")
+        print("=" * 50)
+        print(cached_result["raw"] if isinstance(cached_result, dict) else cached_result)
+        
+        output_path = analysis_manager.save_report(cached_result, parsed_resume, job_description, args.output)
+        print(f"\nAnalysis results saved to: {output_path}")
+        return
+    
     # Step 2: Initialize agents
     print("\n[2] INITIALIZING AGENT SYSTEM...")
     try:
+        from agents import ResumeScreeningAgents
+        
         # Override LLM provider if specified
         if args.provider:
-            config = LLMConfig.from_yaml(args.config)
-            config.provider = args.provider
-            print(f"Using LLM provider: {config.provider}")
+            print(f"Using LLM provider: {llm_config.provider}")
         
         # Initialize agent system
         agents = ResumeScreeningAgents()
@@ -168,7 +242,7 @@ def main():
         
         # Create the crew
         print("\n[3] CREATING AGENT CREW...")
-        crew = agents.create_crew(args.resume, job_description)
+        crew = agents.create_crew(args.resume, job_description, stream=args.stream, use_graph=args.graph)
         print("Created crew with the following agents:")
         for agent in agents.create_agents():
             print(f"- {agent.role}")
@@ -187,6 +261,7 @@ def main():
         # Save results
         output_path = analysis_manager.save_report(result, parsed_resume, job_description, args.output)
         print(f"\nAnalysis results saved to: {output_path}")
+        analysis_manager.store_cached_analysis(cache_key, result)
         
     except Exception as e:
         print(f"\nError during analysis: {str(e)}")
@@ -0,0 +1,116 @@
+"""
+Direct asyncio runner for the resume screening task graph.
+"""
+
+import os
+import asyncio
+from typing import Optional, Callable, Dict, List
+
+from crewai import Crew, Task
+from crewai.crews.crew_output import CrewOutput
+from crewai.tasks.task_output import TaskOutput
+
+from agents import (
+    DOC_PROCESSOR_INSTRUCTIONS, JOB_ANALYZER_INSTRUCTIONS, SKILLS_ANALYZER_INSTRUCTIONS,
+    RESEARCHER_INSTRUCTIONS, MATCHER_INSTRUCTIONS, REPORT_GENERATOR_INSTRUCTIONS,
+    _is_json_output
+)
+
+class ScreeningGraph:
+    """
+    Runs the screening tasks as a dependency graph instead of a Crew:
+
+        doc_proc, jd_analyze (concurrently)
+        doc_proc -> skills_analyze, research (concurrently)
+        skills_analyze, research, jd_analyze -> match -> report
+
+    Nodes call the agents' LLMs directly; only research goes through CrewAI,
+    because it needs the search tool. kickoff()/kickoff_async() mirror Crew and
+    return a CrewOutput, so callers and AnalysisManager treat both alike.
+    on_update(node, output) and task_callback(TaskOutput) are called as each node
+    finishes; stream=True prints the matcher and report generator tokens as they
+    arrive, as in the crew.
+    """
+
+    def __init__(self, screening_agents, resume_path: str, job_description: str,
+                 job_analysis: Optional[str] = None,
+                 on_update: Optional[Callable[[str, str], None]] = None,
+                 stream: bool = False,
+                 task_callback: Optional[Callable[[TaskOutput], None]] = None):
+        if not os.path.exists(resume_path):
+            raise FileNotFoundError(f"Resume file not found at: {resume_path}")
+        self.screening = screening_agents
+        self.resume_path = resume_path
+        self.job_description = job_description
+        self.job_analysis = job_analysis
+        self.on_update = on_update
+        self.stream = stream
+        self.task_callback = task_callback
+        self.cache_scope = screening_agents.semantic_cache_scope(resume_path, job_description)
+        self._outputs: Dict[str, str] = {}
+
+    async def _invoke(self, agent_name: str, prompt: str) -> str:
+        llm = self.screening._get_llm(agent_name, stream=self.stream, cache_scope=self.cache_scope)
+        return await asyncio.to_thread(llm.call, prompt)
+
+    def _done(self, node: str, output: str) -> str:
+        self._outputs[node] = output
+        if self.on_update is not None:
+            self.on_update(node, output)
+        if self.task_callback is not None:
+            self.task_callback(TaskOutput(description=node, agent=node, raw=output))
+        return output
+
+    @staticmethod
+    def _with_context(instructions: str, context: List[str]) -> str:
+        return instructions + "\n\nContext from previous steps:\n\n" + "\n\n---\n\n".join(context)
+
+    async def _doc_proc(self) -> str:
+        prompt = f"{DOC_PROCESSOR_INSTRUCTIONS}\n\nResume file: {self.resume_path}"
+        output = await self._invoke("document_processor", prompt)
+        if not _is_json_output(output):
+            # Same escalation as the Crew guardrail: retry once on the matcher's model
+            output = await self._invoke("matcher", prompt)
+        return self._done("doc_proc", output)
+
+    async def _jd_analyze(self) -> str:
+        if self.job_analysis is None:
+            self.job_analysis = self.screening._jd_cache.get(self.screening._jd_cache_key(self.job_description))
+        if self.job_analysis is not None:
+            return self._done("jd_analyze", self.job_analysis)
+        output = await self._invoke("job_analyzer",
+                                    f"{JOB_ANALYZER_INSTRUCTIONS}\n\nJob description:\n{self.job_description}")
+        self.screening._store_job_analysis(self.screening._jd_cache_key(self.job_description), output)
+        return self._done("jd_analyze", output)
+
+    async def _skills_analyze(self, doc: str) -> str:
+        return self._done("skills_analyze",
+                          await self._invoke("skills_analyzer", self._with_context(SKILLS_ANALYZER_INSTRUCTIONS, [doc])))
+
+    async def _research(self, doc: str) -> str:
+        researcher = self.screening.create_agent("researcher")
+        task = Task(
+            description=self._with_context(RESEARCHER_INSTRUCTIONS, [doc]),
+            agent=researcher,
+            expected_output="A comprehensive report on the candidate's online presence and additional information."
+        )
+        result = await Crew(agents=[researcher], tasks=[task], verbose=False).kickoff_async()
+        return self._done("research", result.raw)
+
+    async def _after_doc(self):
+        doc = await self._doc_proc()
+        return (doc,) + tuple(await asyncio.gather(self._skills_analyze(doc), self._research(doc)))
+
+    async def kickoff_async(self) -> CrewOutput:
+        (doc, skills, research), jd = await asyncio.gather(self._after_doc(), self._jd_analyze())
+        analyses = [doc, jd, skills, research]
+        match = self._done("match", await self._invoke("matcher", self._with_context(MATCHER_INSTRUCTIONS, analyses)))
+        report = self._done("report", await self._invoke(
+            "report_generator", self._with_context(REPORT_GENERATOR_INSTRUCTIONS, analyses + [match])))
+
+        tasks_output = [TaskOutput(description=node, agent=node, raw=output)
+                        for node, output in self._outputs.items()]
+        return CrewOutput(raw=report, tasks_output=tasks_output)
+
+    def kickoff(self) -> CrewOutput:
+        return asyncio.run(self.kickoff_async())
@@ -0,0 +1,62 @@
+"""
+Rate-limited web search tool shared by the resume screening agents.
+"""
+
+import time
+import random
+import threading
+from typing import Any, ClassVar
+
+from crewai_tools import BraveSearchTool
+
+# Backoff for HTTP 429 responses: 2**attempt seconds plus jitter, capped
+_MAX_RETRIES = 5
+_MAX_BACKOFF = 30.0
+
+# BraveSearchTool (crewai_tools 0.45.0, as pinned with crewai 0.120.1) returns HTTP errors
+# as f"Error performing search: {requests_exception}", so a 429 is recognized by this
+# prefix; if a newer crewai_tools rewords the message, 429s are returned without a retry
+_RATE_LIMITED_PREFIX = "Error performing search: 429"
+
+class RateLimiter:
+    """Spaces out calls so that at most `rps` start per second across threads"""
+
+    def __init__(self, rps: float = 1.0):
+        self.min_interval = 1.0 / rps if rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._last_call = 0.0
+
+    def wait(self):
+        """Reserve the next free slot and block until it starts
+
+        Only the reservation holds the lock, so concurrent callers sleep in
+        parallel, each until its own slot.
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._last_call + self.min_interval)
+            self._last_call = slot
+        if slot > now:
+            time.sleep(slot - now)
+
+class RateLimitedBraveSearchTool(BraveSearchTool):
+    """
+    BraveSearchTool that waits on a shared RateLimiter before each request
+    and retries with exponential backoff when Brave answers 429
+    """
+
+    limiter: Any = None
+    # Disable the per-class throttle of BraveSearchTool; the limiter replaces it
+    _min_request_interval: ClassVar[float] = 0.0
+
+    def _run(self, **kwargs: Any) -> Any:
+        for attempt in range(_MAX_RETRIES + 1):
+            if self.limiter is not None:
+                self.limiter.wait()
+            result = super()._run(**kwargs)
+            # BraveSearchTool reports HTTP errors as text instead of raising
+            if not (isinstance(result, str) and result.startswith(_RATE_LIMITED_PREFIX)):
+                return result
+            if attempt < _MAX_RETRIES:
+                time.sleep(min(2 ** attempt + random.random() * 0.5, _MAX_BACKOFF))
+        return result
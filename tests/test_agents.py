@@ -1,8 +1,18 @@
 import os
+import json
 import pytest
-from agents import ResumeScreeningAgents
+import analysis_manager as analysis_manager_module
+from agents import ResumeScreeningAgents, CachedLLM
+from crewai import LLM
+from langchain_core.caches import InMemoryCache
+from analysis_manager import AnalysisManager
 from config import LLMConfig
 from document_parsers import BaseResumeParser
+import search_tools
+import document_parsers
+from collections import OrderedDict
+from types import SimpleNamespace
+from crewai_tools import BraveSearchTool
 
 @pytest.fixture(scope="module")
 def sample_resume_path():
@@ -179,4 +189,392 @@ Random text that is not a job.
         print(f"  Dates: {exp.get('dates')}")
         print(f"  Description Preview: {exp.get('description')[:100]}...")
         
-    assert len(experiences) == 0, f"Expected 0 experiences from problematic_text, got {len(experiences)}" 
\ No newline at end of file
+    assert len(experiences) == 0, f"Expected 0 experiences from problematic_text, got {len(experiences)}" 
+
+def test_experience_parsing_stops_at_next_section():
+    parser = ConcreteTestParser()
+    text = """Jane Doe
+
+Work Experience
+---------------
+Data Engineer at DataCo
+Mar 2021 - Present
+- Built ETL pipelines.
+
+Education
+Bachelor of Science, University of Kyiv
+Sep 2015 - Jun 2019
+"""
+    experiences = parser.extract_work_experience_public(text)
+    assert len(experiences) == 1, f"Expected 1 experience, got {len(experiences)}"
+    assert experiences[0]["company"] == "DataCo"
+    assert "University" not in experiences[0]["description"]
+
+def test_experience_parsing_without_header():
+    parser = ConcreteTestParser()
+    # Job-like lines, but no experience section header
+    text = """Data Engineer at DataCo
+Mar 2021 - Present
+- Built ETL pipelines.
+"""
+    assert parser.extract_work_experience_public(text) == []
+
+# --- LLMConfig per-provider overrides ---
+_PROVIDER_CONFIG_YAML = """llm:
+  provider: {provider}
+  openai:
+    model_name: gpt-3.5-turbo
+    temperature: 0.7
+  ollama:
+    model_name: mistral
+    temperature: 0.6
+  agent_specific:
+    matcher:
+      temperature: 0.3
+      openai:
+        model_name: gpt-4o
+      ollama:
+        model_name: llama3.1:70b
+    researcher:
+      provider: openai
+      model_name: gpt-4
+      temperature: 0.5
+"""
+
+def _provider_config(tmp_path, provider):
+    path = tmp_path / f"{provider}.yaml"
+    path.write_text(_PROVIDER_CONFIG_YAML.format(provider=provider), encoding="utf-8")
+    return LLMConfig.from_yaml(str(path))
+
+@pytest.mark.parametrize("provider, agent, model_name, temperature", [
+    ("openai", "matcher", "gpt-4o", 0.3),
+    ("ollama", "matcher", "ollama/llama3.1:70b", 0.3),
+    ("openai", "researcher", "gpt-4", 0.5),
+    ("ollama", "researcher", "gpt-4", 0.5),  # Pinned to OpenAI whatever the default provider
+    ("openai", "job_analyzer", "gpt-3.5-turbo", 0.7),  # No entry: the default config
+    ("ollama", "job_analyzer", "ollama/mistral", 0.6),
+])
+def test_llmconfig_for_agent_per_provider(tmp_path, provider, agent, model_name, temperature):
+    agent_config = _provider_config(tmp_path, provider).for_agent(agent)
+    assert agent_config.model_name == model_name
+    assert agent_config.temperature == temperature
+
+def test_llmconfig_for_agent_without_overrides_is_default(tmp_path):
+    config = _provider_config(tmp_path, "openai")
+    assert config.for_agent("job_analyzer") is config
+    # The override is a copy; the default config is left unchanged
+    assert config.for_agent("matcher") is not config
+    assert config.model_name == "gpt-3.5-turbo"
+
+def test_llmconfig_for_agent_fallback(tmp_path):
+    fallback = _provider_config(tmp_path, "ollama").fallback("openai")
+    assert fallback.provider == "openai"
+    assert fallback.for_agent("matcher").model_name == "gpt-4o"
+    assert fallback.for_agent("job_analyzer").model_name == "gpt-3.5-turbo"
+
+# --- AnalysisManager report index ---
+def _save(manager, name, job_description, skills=("Python",)):
+    resume = {"name": name, "skills": list(skills), "full_text": "..."}
+    return manager.save_report({"raw": "Total Match Score: 80", "tasks": [], "token_usage": {}},
+                               resume, job_description)
+
+def test_report_index_follows_added_and_deleted_reports(tmp_path):
+    manager = AnalysisManager(str(tmp_path))
+    backend = _save(manager, "Ann Backend", "Senior Go developer for backend services")
+    frontend = _save(manager, "Bob Frontend", "React developer")
+    assert manager.get_reports_for_job("backend") == [backend]
+    
+    # Written without save_report: picked up on the next query
+    outside = tmp_path / "external_report.json"
+    outside.write_text(json.dumps({"candidate_name": "Cy", "job_description": "Backend engineer"}),
+                       encoding="utf-8")
+    assert sorted(manager.get_reports_for_job("backend")) == sorted([backend, str(outside)])
+    
+    os.remove(backend)
+    assert manager.get_reports_for_job("backend") == [str(outside)]
+    assert manager.get_reports_for_job("react") == [frontend]
+
+@pytest.mark.parametrize("keyword", ["Go", "g", "%", "_"])
+def test_report_index_short_and_special_keywords(tmp_path, keyword):
+    # Under 3 characters the trigram index cannot help, but LIKE still has to find the match
+    manager = AnalysisManager(str(tmp_path))
+    go = _save(manager, "Ann Backend", "Go developer, 100% remote, on_call")
+    _save(manager, "Bob Frontend", "React developer")
+    assert manager.get_reports_for_job(keyword) == [go]
+
+def test_report_search_without_fts(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_manager_module, "_fts_available", False)
+    manager = AnalysisManager(str(tmp_path))
+    go = _save(manager, "Ann Backend", "Go developer")
+    _save(manager, "Bob Frontend", "React developer")
+    assert manager.get_reports_for_job("go") == [go]
+
+# --- AnalysisManager resume store ---
+def test_stored_resume_round_trip(tmp_path):
+    manager = AnalysisManager(str(tmp_path))
+    first = _save(manager, "Ann Backend", "Go developer", skills=("Go", "SQL"))
+    
+    with open(first, encoding="utf-8") as f:
+        raw_report = json.load(f)
+    assert "parsed_resume" not in raw_report
+    resume_hash = raw_report["parsed_resume_ref"]
+    
+    # The resume is stored once (without full_text), next to its skills sidecar
+    resumes_dir = tmp_path / "resumes"
+    assert sorted(p.name for p in resumes_dir.iterdir() if p.name.startswith(resume_hash)) == sorted(
+        [resume_hash + ".skills.json",
+         resume_hash + (".json.zst" if analysis_manager_module.zstandard is not None else ".json")])
+    report = manager.load_report(first)
+    assert report["parsed_resume"] == {"name": "Ann Backend", "skills": ["Go", "SQL"]}
+    
+    # compare_candidates reads only the sidecar; without it, the stored resume is loaded
+    assert manager.compare_candidates([first])["candidates"][0]["skills"] == ["Go", "SQL"]
+    os.remove(resumes_dir / (resume_hash + ".skills.json"))
+    assert manager.compare_candidates([first])["candidates"][0]["skills"] == ["Go", "SQL"]
+
+def test_explicit_output_path_keeps_resume_inline(tmp_path):
+    manager = AnalysisManager(str(tmp_path / "reports"))
+    output = manager.save_report("done", {"name": "Ann", "skills": ["Go"]}, "Go developer",
+                                 str(tmp_path / "results.json"))
+    with open(output, encoding="utf-8") as f:
+        assert json.load(f)["parsed_resume"] == {"name": "Ann", "skills": ["Go"]}
+    assert not (tmp_path / "resumes").exists()
+    assert not (tmp_path / "reports" / "resumes").exists()
+
+# --- AnalysisManager zstd reports ---
+@pytest.mark.skipif(analysis_manager_module.zstandard is None, reason="zstandard not installed")
+def test_zst_reports_mixed_with_json(tmp_path, monkeypatch):
+    plain = _save(AnalysisManager(str(tmp_path)), "Ann Backend", "Go developer")
+    compressed = _save(AnalysisManager(str(tmp_path), compress=True), "Bob Backend", "Go developer")
+    assert plain.endswith(".json") and compressed.endswith(".json.zst")
+    
+    manager = AnalysisManager(str(tmp_path))
+    assert sorted(manager.list_reports()) == sorted([plain, compressed])
+    assert manager.load_report(compressed)["parsed_resume"]["name"] == "Bob Backend"
+    assert manager.load_report_fields(compressed, {"candidate_name"}) == {"candidate_name": "Bob Backend"}
+    assert sorted(manager.get_reports_for_job("go")) == sorted([plain, compressed])
+    comparison = manager.compare_candidates(manager.list_reports())
+    assert sorted(c["name"] for c in comparison["candidates"]) == ["Ann Backend", "Bob Backend"]
+    
+    # Without zstandard, .zst files (including the stored resumes) are unreadable, plain reports are not
+    monkeypatch.setattr(analysis_manager_module, "zstandard", None)
+    with pytest.raises(ValueError, match="zstandard"):
+        manager.load_report(compressed)
+    assert manager.load_report_fields(plain, {"candidate_name"}) == {"candidate_name": "Ann Backend"}
+
+def test_reports_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(analysis_manager_module, "zstandard", None)
+    manager = AnalysisManager(str(tmp_path), compress=True)
+    # compress=True quietly falls back to plain JSON, for reports and stored resumes alike
+    report_path = _save(manager, "Ann Backend", "Go developer")
+    assert report_path.endswith(".json")
+    assert manager.load_report(report_path)["parsed_resume"]["name"] == "Ann Backend"
+    assert not any(p.name.endswith(".zst") for p in (tmp_path / "resumes").iterdir())
+    # An explicit .json.zst path cannot be honoured
+    with pytest.raises(ValueError):
+        manager.save_report("done", {"name": "Bob"}, "Go developer", str(tmp_path / "bob.json.zst"))
+
+# --- Brave Search rate limiting ---
+class _FakeClock:
+    """Stands in for the time module: sleep() only advances monotonic()"""
+    
+    def __init__(self, start=100.0):
+        self.now = start
+        self.sleeps = []
+    
+    def monotonic(self):
+        return self.now
+    
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def fake_clock(monkeypatch):
+    clock = _FakeClock()
+    monkeypatch.setattr(search_tools, "time", clock)
+    monkeypatch.setattr(search_tools.random, "random", lambda: 0.0)
+    return clock
+
+@pytest.fixture
+def brave_tool(monkeypatch):
+    monkeypatch.setenv("BRAVE_API_KEY", "test")
+    return search_tools.RateLimitedBraveSearchTool()
+
+def _stub_brave(monkeypatch, results):
+    calls = []
+    def fake_run(self, **kwargs):
+        calls.append(kwargs)
+        return results[min(len(calls), len(results)) - 1]
+    monkeypatch.setattr(BraveSearchTool, "_run", fake_run)
+    return calls
+
+def test_rate_limiter_spaces_calls(fake_clock):
+    limiter = search_tools.RateLimiter(rps=2)
+    limiter.wait()
+    limiter.wait()
+    fake_clock.now += 2
+    limiter.wait()
+    assert fake_clock.sleeps == [0.5]
+
+def test_rate_limiter_does_not_sleep_under_lock(monkeypatch):
+    # Each caller reserves its own slot, so the second one does not wait for the first to sleep
+    clock = _FakeClock()
+    monkeypatch.setattr(search_tools, "time", clock)
+    limiter = search_tools.RateLimiter(rps=1)
+    held = []
+    clock.sleep = lambda seconds: held.append((seconds, limiter._lock.locked()))
+    limiter.wait()
+    limiter.wait()
+    limiter.wait()
+    assert held == [(1.0, False), (2.0, False)]
+
+def test_brave_retries_on_429(fake_clock, brave_tool, monkeypatch):
+    calls = _stub_brave(monkeypatch, [search_tools._RATE_LIMITED_PREFIX + " Client Error"] * 2 + ["results"])
+    brave_tool.limiter = search_tools.RateLimiter(rps=0)
+    assert brave_tool._run(query="python") == "results"
+    assert calls == [{"query": "python"}] * 3
+    assert fake_clock.sleeps == [1, 2]
+
+def test_brave_other_errors_are_not_retried(fake_clock, brave_tool, monkeypatch):
+    calls = _stub_brave(monkeypatch, ["Error performing search: 500 Server Error"])
+    assert brave_tool._run(query="python") == "Error performing search: 500 Server Error"
+    assert len(calls) == 1
+    assert fake_clock.sleeps == []
+
+def test_brave_backoff_is_capped(fake_clock, brave_tool, monkeypatch):
+    monkeypatch.setattr(search_tools, "_MAX_RETRIES", 7)
+    rate_limited = search_tools._RATE_LIMITED_PREFIX + " Client Error"
+    calls = _stub_brave(monkeypatch, [rate_limited])
+    # After the last retry the 429 text is returned as is
+    assert brave_tool._run(query="python") == rate_limited
+    assert len(calls) == 8
+    assert fake_clock.sleeps == [1, 2, 4, 8, 16, 30.0, 30.0]
+
+# --- In-process parse cache ---
+@pytest.fixture
+def txt_resume(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_parsers, "_parse_cache", OrderedDict())
+    path = tmp_path / "resume.txt"
+    path.write_text("Ann Backend\nann@example.com\nSkills: Python, SQL\n", encoding="utf-8")
+    return path
+
+def _count_parses(monkeypatch, parser_cls):
+    calls = []
+    extract_name = parser_cls._extract_name
+    def counting(self, text):
+        calls.append(text)
+        return extract_name(self, text)
+    monkeypatch.setattr(parser_cls, "_extract_name", counting)
+    return calls
+
+def test_parse_cache_reuses_identical_files(txt_resume, tmp_path, monkeypatch):
+    calls = _count_parses(monkeypatch, document_parsers.TXTResumeParser)
+    parser = document_parsers.TXTResumeParser()
+    first = parser.parse(str(txt_resume))
+    # Same bytes under another name are a hit, changed bytes are not
+    copy_path = tmp_path / "copy.txt"
+    copy_path.write_bytes(txt_resume.read_bytes())
+    assert parser.parse(str(copy_path)) == first
+    assert len(calls) == 1
+    txt_resume.write_text("Bob Frontend\n", encoding="utf-8")
+    assert parser.parse(str(txt_resume))["name"] != first["name"]
+    assert len(calls) == 2
+
+def test_parse_cache_returns_copies(txt_resume):
+    parser = document_parsers.TXTResumeParser()
+    first = parser.parse(str(txt_resume))
+    expected = json.loads(json.dumps(first))
+    first["name"] = "Changed"
+    first["skills"].append("Cobol")
+    assert parser.parse(str(txt_resume)) == expected
+
+# --- On-disk parse cache ---
+@pytest.fixture
+def disk_cache(tmp_path, monkeypatch):
+    """Points the disk cache at tmp_path and counts the parses that reach a parser"""
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(document_parsers, "RESUME_CACHE_DIR", str(cache_dir))
+    monkeypatch.delenv("RESUME_CACHE_TTL", raising=False)
+    calls = []
+    get_resume_parser = document_parsers.get_resume_parser
+    def counting(file_path):
+        calls.append(file_path)
+        return get_resume_parser(file_path)
+    monkeypatch.setattr(document_parsers, "get_resume_parser", counting)
+    return SimpleNamespace(dir=cache_dir, calls=calls)
+
+def test_disk_cache_hit(txt_resume, disk_cache):
+    first = document_parsers.parse_resume(str(txt_resume))
+    assert len(list(disk_cache.dir.glob("*.txt.json"))) == 1
+    assert document_parsers.parse_resume(str(txt_resume)) == first
+    assert len(disk_cache.calls) == 1
+
+def test_disk_cache_expiry(txt_resume, disk_cache, monkeypatch):
+    monkeypatch.setenv("RESUME_CACHE_TTL", "60")
+    document_parsers.parse_resume(str(txt_resume))
+    written = os.path.getmtime(next(disk_cache.dir.glob("*.txt.json")))
+    
+    monkeypatch.setattr(document_parsers, "time", SimpleNamespace(time=lambda: written + 59))
+    document_parsers.parse_resume(str(txt_resume))
+    assert len(disk_cache.calls) == 1
+    monkeypatch.setattr(document_parsers, "time", SimpleNamespace(time=lambda: written + 61))
+    document_parsers.parse_resume(str(txt_resume))
+    assert len(disk_cache.calls) == 2
+
+def test_disk_cache_disabled(txt_resume, disk_cache, monkeypatch):
+    monkeypatch.setenv("RESUME_CACHE_TTL", "0")
+    document_parsers.parse_resume(str(txt_resume))
+    document_parsers.parse_resume(str(txt_resume))
+    assert len(disk_cache.calls) == 2
+    assert not disk_cache.dir.exists()
+
+# --- CachedLLM ---
+@pytest.fixture
+def provider_calls(monkeypatch):
+    """Replaces LLM.call, the provider round trip behind CachedLLM, and records its arguments"""
+    calls = []
+    def fake_call(self, messages, tools=None, callbacks=None, available_functions=None):
+        calls.append((messages, tools))
+        return f"answer {len(calls)}"
+    monkeypatch.setattr(LLM, "call", fake_call)
+    return calls
+
+def test_cached_llm_hit_skips_provider(provider_calls):
+    llm = CachedLLM(response_cache=InMemoryCache(), model="gpt-4o-mini")
+    assert llm.call("Summarize the resume") == "answer 1"
+    assert llm.call([{"role": "user", "content": "Summarize the resume"}]) == "answer 1"
+    assert len(provider_calls) == 1
+    assert llm.call("Another prompt") == "answer 2"
+    assert len(provider_calls) == 2
+
+def test_cached_llm_scope_and_model_are_part_of_the_key(provider_calls):
+    cache = InMemoryCache()
+    CachedLLM(response_cache=cache, model="gpt-4o-mini", cache_scope="a").call("Prompt")
+    CachedLLM(response_cache=cache, model="gpt-4o-mini", cache_scope="b").call("Prompt")
+    CachedLLM(response_cache=cache, model="gpt-4o", cache_scope="a").call("Prompt")
+    assert len(provider_calls) == 3
+    assert CachedLLM(response_cache=cache, model="gpt-4o-mini", cache_scope="a").call("Prompt") == "answer 1"
+    assert len(provider_calls) == 3
+
+def test_cached_llm_never_caches_tool_calls(provider_calls):
+    cache = InMemoryCache()
+    llm = CachedLLM(response_cache=cache, model="gpt-4o-mini")
+    tools = [{"type": "function", "function": {"name": "search"}}]
+    assert llm.call("Find the company", tools=tools) == "answer 1"
+    assert llm.call("Find the company", tools=tools) == "answer 2"
+    # A tool call's answer is not stored for plain calls either
+    assert llm.call("Find the company") == "answer 3"
+    assert [tools for _, tools in provider_calls] == [tools, tools, None]
+
+# --- Education extraction ---
+def test_education_keeps_overlapping_degrees(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Ann Backend\n"
+                    "M.S. in Computer Science, University of Texas, 2018 - 2020\n"
+                    "Bachelor of Science B.S. in Physics, University of Ohio, 2014 - 2018\n",
+                    encoding="utf-8")
+    education = document_parsers.TXTResumeParser()._extract_education(path.read_text(encoding="utf-8"))
+    # Full degree names first, then abbreviations; the B.S. inside the Bachelor entry is kept
+    assert [entry["degree"].split()[0] for entry in education] == ["Bachelor", "M.S.", "B.S."]
+    assert all(entry["institution"].startswith("University of") for entry in education)